@@ -1,7 +1,7 @@
 """
 Superclass Game
 """
-from typing import Any
+from typing import Any, Optional
 from game_state import GameState
 
 
@@ -36,6 +36,29 @@ class Game:
         """
         raise NotImplementedError
 
+    def winner(self, state: GameState) -> Optional[str]:
+        """
+        Return 'p1' or 'p2' if that player has won the game at state, or None
+        if nobody has won at state.
+
+        Unlike is_winner, this looks at state rather than current_state, so
+        it never changes the game and is safe to call from any search.
+        """
+        raise NotImplementedError
+
+    def terminal_value(self, state: GameState) -> int:
+        """
+        Return the score of state for the player whose turn it is at state:
+        WIN if they have won, LOSE if their opponent has won and DRAW if
+        nobody has won.
+        """
+        winner = self.winner(state)
+        if winner is None:
+            return state.DRAW
+        if winner == state.get_current_player_name():
+            return state.WIN
+        return state.LOSE
+
     def str_to_move(self, string: str) -> Any:
         """
         Return the move that string represents. If string is not a move,
@@ -10,9 +10,10 @@ your own curiousity!)
 """
 # TODO: import the modules needed to make game_interface run.
 from strategy import *
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 from subtract_square_game import SubtractSquareGame
 from stonehenge import StonehengeGame
+from subtract_square_solver import perfect_play_strategy
 
 # TODO: Replace None with the corresponding class name for your games.
 # 'h' should map to Stonehenge.
@@ -22,9 +23,24 @@ playable_games = {'s': SubtractSquareGame,
 # TODO: Replace None with the corresponding function names for your strategies.
 # 'mr' should map to your recursive implementation of minimax while
 # 'mi' should map to your iterative implementation of minimax
+# 'ab' maps to minimax with alpha-beta pruning
+# 'id' maps to the time-budgeted iterative deepening search
+# 'ro' maps to the one-move lookahead using rough_outcome()
+# 'pm' maps to minimax_rec with the root's children solved in parallel
+# 'pp' maps to the SubtractSquare solver's perfect play, or to minimax_ab on
+# other games
 usable_strategies = {'i': interactive_strategy,
                      'mr': minimax_rec,
-                     'mi': minimax_iter}
+                     'pm': minimax_parallel,
+                     'mi': minimax_iter,
+                     'ab': minimax_ab,
+                     'id': iterative_deepening,
+                     'ro': rough_outcome_strategy,
+                     'pp': perfect_play_strategy}
+
+# The option that sets the size of each of the playable games
+SIZE_OPTIONS = {'s': 'current_total',
+                'h': 'length'}
 
 
 class GameInterface:
@@ -34,25 +50,33 @@ class GameInterface:
     """
 
     def __init__(self, game: Any, p1_strategy: Callable,
-                 p2_strategy: Callable[[Any], Any]) -> None:
+                 p2_strategy: Callable[[Any], Any],
+                 p1_starts: Optional[bool] = None, **game_options: Any) -> None:
         """
         Initialize this GameInterface, setting its active game to game, and
         using the strategies p1_strategy for Player 1 and p2_strategy for
         Player 2.
 
+        The user is asked whether Player 1 moves first unless p1_starts is
+        given. game_options are passed on to the game, so a game given all
+        of its options (e.g. current_total=18 or length=3) asks nothing.
+
         :param game: The game to be played.
         :type game:
         :param p1_strategy: The strategy for Player 1.
         :type p1_strategy:
         :param p2_strategy: The strategy for Play 2.
         :type p2_strategy:
+        :param p1_starts: Whether Player 1 moves first, or None to ask.
+        :type p1_starts: bool | None
         """
-        first_player = input("Type y if player 1 is to make the first move: ")
-        is_p1_turn = False
-        if first_player.lower() == 'y':
-            is_p1_turn = True
+        is_p1_turn = p1_starts
+        if is_p1_turn is None:
+            first_player = input(
+                "Type y if player 1 is to make the first move: ")
+            is_p1_turn = first_player.lower() == 'y'
 
-        self.game = game(is_p1_turn)
+        self.game = game(is_p1_turn, **game_options)
         self.p1_strategy = p1_strategy
         self.p2_strategy = p2_strategy
 
@@ -101,6 +125,33 @@ class GameInterface:
             print("It's a tie!")
 
 
+def make_game(game_key: str, size: int, p1_starts: bool = True) -> Any:
+    """
+    Return a new game of the kind playable_games maps game_key to, of the
+    given size (passed as the option SIZE_OPTIONS[game_key]), without asking
+    the user for anything.
+
+    >>> make_game('s', 18).current_state.current_total
+    18
+    >>> make_game('h', 2, False).current_state.get_current_player_name()
+    'p2'
+    """
+    return playable_games[game_key](p1_starts,
+                                    **{SIZE_OPTIONS[game_key]: size})
+
+
+def make_interface(game_key: str, p1_key: str, p2_key: str, size: int,
+                   p1_starts: bool = True) -> 'GameInterface':
+    """
+    Return a GameInterface for the game and strategies that playable_games
+    and usable_strategies map game_key, p1_key and p2_key to, with a game of
+    the given size, without asking the user for anything.
+    """
+    return GameInterface(playable_games[game_key], usable_strategies[p1_key],
+                         usable_strategies[p2_key], p1_starts,
+                         **{SIZE_OPTIONS[game_key]: size})
+
+
 if __name__ == '__main__':
     games = ", ".join(["'{}': {}".format(key, playable_games[key].__name__) if
                        playable_games[key] is not None else
@@ -15,6 +15,7 @@ class GameState:
     DRAW - score if player is in a tied position
     p1_turn - whether it is p1's turn or not
     """
+    __slots__ = ('p1_turn',)
     WIN: int = 1
     LOSE: int = -1
     DRAW: int = 0
@@ -55,6 +56,19 @@ class GameState:
         """
         raise NotImplementedError
 
+    def push(self, move: Any) -> None:
+        """
+        Apply move to this GameState in place, so that a search can walk the
+        game tree on a single state instead of making a new state per move.
+        """
+        raise NotImplementedError
+
+    def pop(self) -> None:
+        """
+        Undo the last move applied to this GameState by push().
+        """
+        raise NotImplementedError
+
     def is_valid_move(self, move: Any) -> bool:
         """
         Return whether move is a valid move for this GameState.
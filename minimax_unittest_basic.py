@@ -21,11 +21,18 @@ strategy with Chopsticks either, unless you handle repeated/looping states.
 import unittest
 from unittest.mock import patch
 import inspect
+import time
+import tracemalloc
 
 # Import the student solution
+import strategy
 from game_interface import playable_games, usable_strategies
 minimax_iterative_strategy = usable_strategies['mi']
 minimax_recursive_strategy = usable_strategies['mr']
+minimax_alphabeta_strategy = usable_strategies['ab']
+iterative_deepening_strategy = usable_strategies['id']
+rough_outcome_strategy = usable_strategies['ro']
+minimax_parallel_strategy = usable_strategies['pm']
 StonehengeGame = playable_games['h']
 SubtractSquareGame = playable_games['s']
 
@@ -232,5 +239,364 @@ class MinimaxUnitTests(unittest.TestCase):
                              expected_move, move_chosen, str(new_state)
                          ))
 
+    def count_make_moves(self, game, minimax_strategy):
+        """
+        Return the move chosen by minimax_strategy on game, together with the
+        number of times it called make_move.
+        """
+        state_class = type(game.current_state)
+        make_move = state_class.make_move
+        calls = []
+
+        def counted_make_move(state, move):
+            calls.append(move)
+            return make_move(state, move)
+
+        with patch.object(state_class, 'make_move', counted_make_move):
+            move_chosen = minimax_strategy(game)
+        return move_chosen, len(calls)
+
+    def count_position_edges(self, game):
+        """
+        Return the number of (position, move) pairs reachable from the
+        current state of game, counting transposed positions once.
+        """
+        seen = set()
+        to_visit = [game.current_state]
+        edges = 0
+        while to_visit:
+            state = to_visit.pop()
+            key = strategy.state_key(state)
+            if key in seen or game.is_over(state):
+                continue
+            seen.add(key)
+            for move in state.get_possible_moves():
+                edges += 1
+                to_visit.append(state.make_move(move))
+        return edges
+
+    def test_recursive_make_move_benchmark(self):
+        """
+        Regression benchmark: recursive minimax should search every child
+        once, and every distinct position once. The old double recursion
+        called make_move 565284 times on SubtractSquare with a value of 18.
+        """
+        with patch('builtins.input', return_value='18'):
+            square_game = SubtractSquareGame(True)
+        with patch('builtins.input', return_value='2'):
+            stonehenge_game = StonehengeGame(True)
+
+        for game in [square_game, stonehenge_game]:
+            edges = self.count_position_edges(game)
+            _, calls = self.count_make_moves(game,
+                                             minimax_recursive_strategy)
+            self.assertLessEqual(calls, edges,
+                                 ("Recursive minimax called make_move {} " +
+                                  "times, but there are only {} distinct " +
+                                  "(position, move) pairs to search.").format(
+                                      calls, edges))
+
+    def test_strategies_leave_current_state_alone(self):
+        """
+        Test that no minimax strategy assigns to game.current_state while it
+        searches, so a game can be shared between searches.
+        """
+        with patch('builtins.input', return_value='18'):
+            square_game = SubtractSquareGame(True)
+        with patch('builtins.input', return_value='2'):
+            stonehenge_game = StonehengeGame(True)
+
+        for game in [square_game, stonehenge_game]:
+            game_class = type(game)
+
+            def refuse_assignment(obj, name, value):
+                raise AssertionError("{} was assigned during a search.".format(
+                    name))
+
+            with patch.object(game_class, '__setattr__', refuse_assignment):
+                for minimax_strategy in [minimax_recursive_strategy,
+                                         minimax_iterative_strategy,
+                                         minimax_alphabeta_strategy,
+                                         iterative_deepening_strategy]:
+                    minimax_strategy(game)
+
+    def test_parallel_matches_recursive(self):
+        """
+        Test that parallel minimax returns the same move as recursive
+        minimax on games of SubtractSquare and Stonehenge, including
+        positions where no move wins.
+        """
+        games = []
+        for total in [5, 17, 18, 34]:
+            with patch('builtins.input', return_value=str(total)):
+                games.append(SubtractSquareGame(True))
+        for moves in [[], ['A', 'F'], ['B', 'D', 'G']]:
+            with patch('builtins.input', return_value='2'):
+                game = StonehengeGame(True)
+            for move in moves:
+                game.current_state = game.current_state.make_move(move)
+            games.append(game)
+
+        pools = set()
+        for game in games:
+            expected = minimax_recursive_strategy(game)
+            move_chosen = minimax_parallel_strategy(game, 2)
+            self.assertEqual(move_chosen, expected,
+                             ("Parallel minimax chose {} but recursive " +
+                              "minimax chose {} from:\n{}").format(
+                                  move_chosen, expected, game.current_state))
+            if strategy._pool is not None:
+                pools.add(id(strategy._pool))
+        self.assertEqual(len(pools), 1,
+                         "Parallel minimax should reuse one pool of " +
+                         "workers across calls.")
+
+    def test_winner_and_terminal_value(self):
+        """
+        Test winner() and terminal_value() on finished and unfinished games.
+        """
+        with patch('builtins.input', return_value='1'):
+            game = StonehengeGame(True)
+        state = game.current_state
+        self.assertIsNone(game.winner(state))
+        self.assertEqual(game.terminal_value(state), state.DRAW)
+        state = state.make_move('A')
+        self.assertEqual(game.winner(state), 'p1')
+        self.assertEqual(game.terminal_value(state), state.LOSE)
+
+        with patch('builtins.input', return_value='4'):
+            game = SubtractSquareGame(False)
+        state = game.current_state.make_move(4)
+        self.assertEqual(game.winner(state), 'p2')
+        self.assertEqual(game.terminal_value(state), state.LOSE)
+
+    def test_alphabeta_subtract_square_18(self):
+        """
+        Test alpha-beta minimax on a game of SubtractSquare with a value of 18.
+        The chosen move should be 16 or 1, as picking 4 or 9 will result in a
+        loss.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+
+        move_chosen = minimax_alphabeta_strategy(game)
+        expected_moves = [game.str_to_move("1"), game.str_to_move("16")]
+
+        self.assertTrue(move_chosen in expected_moves,
+                        ("Calling alpha-beta minimax on a game of " +
+                         "SubtractSquare with " +
+                         "a value of {} should result in a move in {} " +
+                         "being returned, but {} was returned instead.").format(
+                            18, expected_moves, move_chosen
+                        ))
+
+    def test_alphabeta_stonehenge_one_winning_move_not_immediate(self):
+        """
+        Test alpha-beta minimax on a game of Stonehenge where there is only 1
+        winning move that is not immediately in sight.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        for move in ['A', 'F', 'D']:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = minimax_alphabeta_strategy(game)
+        expected_move = game.str_to_move('E')
+
+        self.assertEqual(move_chosen, expected_move,
+                         ("Calling alpha-beta minimax on a game of " +
+                          "Stonehenge with the following board should " +
+                          "return the move {} but got {} instead.\n{}").format(
+                              expected_move, move_chosen,
+                              str(game.current_state)))
+
+    def test_alphabeta_expands_fewer_nodes(self):
+        """
+        Test that alpha-beta minimax calls make_move fewer times than
+        recursive minimax on a new game of Stonehenge with a side-length of 2.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+
+        _, recursive_calls = self.count_make_moves(
+            game, minimax_recursive_strategy)
+        _, alphabeta_calls = self.count_make_moves(
+            game, minimax_alphabeta_strategy)
+
+        self.assertLess(alphabeta_calls, recursive_calls,
+                        ("Alpha-beta minimax called make_move {} times, " +
+                         "but recursive minimax only needed {}.").format(
+                             alphabeta_calls, recursive_calls))
+
+    def test_iterative_deepening_subtract_square_18(self):
+        """
+        Test iterative deepening on a game of SubtractSquare with a value of
+        18. The search finishes well within its budget, so the move should be
+        16 or 1, as picking 4 or 9 will result in a loss.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+
+        move_chosen = iterative_deepening_strategy(game)
+        expected_moves = [game.str_to_move("1"), game.str_to_move("16")]
+
+        self.assertTrue(move_chosen in expected_moves,
+                        ("Calling iterative deepening on a game of " +
+                         "SubtractSquare with " +
+                         "a value of {} should result in a move in {} " +
+                         "being returned, but {} was returned instead.").format(
+                            18, expected_moves, move_chosen
+                        ))
+
+    def test_iterative_deepening_respects_time_limit(self):
+        """
+        Test that iterative deepening returns a valid move close to its time
+        limit on a game of SubtractSquare too large to search exhaustively.
+        """
+        with patch('builtins.input', return_value='2000'):
+            game = SubtractSquareGame(True)
+
+        start = time.monotonic()
+        move_chosen = iterative_deepening_strategy(game, 0.2)
+        elapsed = time.monotonic() - start
+
+        self.assertTrue(game.current_state.is_valid_move(move_chosen),
+                        ("Iterative deepening returned {}, which is not a " +
+                         "valid move.").format(move_chosen))
+        self.assertLess(elapsed, 1.0,
+                        ("Iterative deepening with a time limit of 0.2 " +
+                         "seconds took {:.2f} seconds.").format(elapsed))
+
+    def test_iterative_deepening_stonehenge_not_immediate(self):
+        """
+        Test iterative deepening on a game of Stonehenge where there is only 1
+        winning move that is not immediately in sight.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        for move in ['A', 'F', 'D']:
+            game.current_state = game.current_state.make_move(
+                game.str_to_move(move))
+
+        move_chosen = iterative_deepening_strategy(game)
+        self.assertEqual(move_chosen, game.str_to_move('E'),
+                         ("Calling iterative deepening on a game of " +
+                          "Stonehenge with the following board should " +
+                          "return the move E but got {} instead.\n{}").format(
+                              move_chosen, game.current_state))
+
+    def test_rough_outcome_stonehenge_large_board(self):
+        """
+        Test that the rough outcome strategy plays a game of Stonehenge with
+        a side-length of 8 to the end, taking an immediate win when it has
+        one and choosing every move quickly.
+        """
+        with patch('builtins.input', return_value='8'):
+            game = StonehengeGame(True)
+
+        while not game.is_over(game.current_state):
+            state = game.current_state
+            start = time.monotonic()
+            move_chosen = rough_outcome_strategy(game)
+            elapsed = time.monotonic() - start
+            self.assertTrue(state.is_valid_move(move_chosen))
+            self.assertLess(elapsed, 0.5,
+                            ("The rough outcome strategy took {:.2f} " +
+                             "seconds to choose a move.").format(elapsed))
+            game.current_state = state.make_move(move_chosen)
+            if state.rough_outcome() == state.WIN:
+                self.assertTrue(game.is_over(game.current_state),
+                                ("The rough outcome strategy should win " +
+                                 "straight away from:\n{}").format(state))
+
+    def test_iterative_subtract_square_large_total(self):
+        """
+        Test iterative minimax on a game of SubtractSquare with a value of
+        1000, which is too deep for the recursion limit, and check that it
+        reports its node throughput.
+        """
+        with patch('builtins.input', return_value='1000'):
+            game = SubtractSquareGame(True)
+
+        stats = strategy.SearchStats()
+        move_chosen = minimax_iterative_strategy(game, stats)
+
+        self.assertTrue(game.current_state.is_valid_move(move_chosen),
+                        ("Iterative minimax returned {}, which is not a " +
+                         "valid move.").format(move_chosen))
+        self.assertGreater(stats.nodes, 0,
+                           "Iterative minimax did not count any nodes.")
+        self.assertGreater(stats.nodes_per_second(), 0,
+                           "Iterative minimax did not report its throughput.")
+
+    def test_iterative_streaming_searches_as_much(self):
+        """
+        Test that streaming iterative minimax, whose table is bounded, looks
+        at about as many positions as keeping every position scored, on a
+        game of SubtractSquare with a value of 2000.
+        """
+        nodes = []
+        for streaming in [True, False]:
+            game = SubtractSquareGame(True, 2000)
+            stats = strategy.SearchStats()
+            minimax_iterative_strategy(game, stats, streaming)
+            nodes.append(stats.nodes)
+
+        self.assertLess(nodes[0], nodes[1] * 1.05,
+                        ("Streaming iterative minimax looked at {} " +
+                         "positions, but keeping every position scored " +
+                         "looked at {}.").format(*nodes))
+
+    def test_iterative_streaming_frees_subtrees(self):
+        """
+        Test that streaming iterative minimax picks the same move as keeping
+        the whole search tree, while using much less memory at its peak, and
+        that its peak memory does not grow with the number of positions it
+        searches.
+        """
+        with patch('builtins.input', return_value='300'):
+            game = SubtractSquareGame(True)
+
+        peaks = []
+        moves = []
+        for streaming in [True, False]:
+            tracemalloc.start()
+            moves.append(minimax_iterative_strategy(game,
+                                                    streaming=streaming))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        self.assertEqual(moves[0], moves[1],
+                         ("Streaming iterative minimax chose {}, but keeping " +
+                          "the whole tree chose {}.").format(*moves))
+        self.assertLess(peaks[0] * 4, peaks[1],
+                        ("Streaming iterative minimax peaked at {} bytes, " +
+                         "while keeping the whole tree peaked at {}.").format(
+                             *peaks))
+
+        peaks = []
+        nodes = []
+        for moves in ['ABCDE', 'ABCD']:
+            with patch('builtins.input', return_value='3'):
+                game = StonehengeGame(True)
+            for move in moves:
+                game.current_state = game.current_state.make_move(move)
+            stats = strategy.SearchStats()
+            with patch.object(strategy, 'STREAMING_TABLE_SIZE', 64):
+                tracemalloc.start()
+                minimax_iterative_strategy(game, stats)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            nodes.append(stats.nodes)
+
+        self.assertGreater(nodes[1], nodes[0] * 3)
+        self.assertLess(peaks[1], peaks[0] * 1.5,
+                        ("Streaming iterative minimax peaked at {} bytes " +
+                         "searching {} positions, but at {} bytes searching " +
+                         "{}.").format(peaks[1], nodes[1], peaks[0],
+                                       nodes[0]))
+
 if __name__ == "__main__":
     unittest.main()
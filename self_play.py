@@ -0,0 +1,146 @@
+"""
+A headless runner that plays many games between two strategies.
+
+Unlike GameInterface.play, nothing is printed while the games are played:
+each game is kept as a compact GameRecord of its moves, its winner and the
+time each move took.
+
+    python self_play.py h ro ab --games 1000 --size 3 --output records.jsonl
+
+NOTE: You do not have to run python_ta on this file.
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TextIO
+
+from game_interface import SIZE_OPTIONS, make_game, usable_strategies
+
+
+class GameRecord:
+    """
+    The result of one game played by play_game.
+
+    moves - the moves made, in order
+    winner - 'p1' or 'p2', or None if nobody won
+    move_times - the seconds each move took its strategy to choose
+    """
+    moves: List[Any]
+    winner: Optional[str]
+    move_times: List[float]
+
+    def __init__(self, moves: List[Any], winner: Optional[str],
+                 move_times: List[float]) -> None:
+        self.moves = moves
+        self.winner = winner
+        self.move_times = move_times
+
+    def to_json(self) -> str:
+        """
+        Return this record as a single line of JSON, with the move times
+        rounded to the microsecond.
+
+        >>> GameRecord([9, 1], 'p2', [0.5, 0.0000012]).to_json()
+        '{"moves": [9, 1], "winner": "p2", "times": [0.5, 1e-06]}'
+        """
+        return json.dumps({'moves': self.moves, 'winner': self.winner,
+                           'times': [round(t, 6) for t in self.move_times]})
+
+
+def play_game(game: Any, p1_strategy: Callable[[Any], Any],
+              p2_strategy: Callable[[Any], Any]) -> GameRecord:
+    """
+    Play game to the end with p1_strategy and p2_strategy choosing the moves
+    of Player 1 and Player 2, and return the record of the game.
+
+    Raise ValueError if a strategy chooses a move that is not valid, since
+    asking a strategy again would not change its answer.
+    """
+    state = game.current_state
+    moves = []
+    move_times = []
+    while not game.is_over(state):
+        strategy = p1_strategy if state.p1_turn else p2_strategy
+        start = time.perf_counter()
+        move = strategy(game)
+        move_times.append(time.perf_counter() - start)
+        if not state.is_valid_move(move):
+            raise ValueError("{} chose the invalid move {!r}.".format(
+                strategy.__name__, move))
+        moves.append(move)
+        state = state.make_move(move)
+        game.current_state = state
+    return GameRecord(moves, game.winner(state), move_times)
+
+
+def self_play(game_key: str, p1_key: str, p2_key: str, games: int,
+              size: int, p1_starts: bool = True) -> Iterator[GameRecord]:
+    """
+    Yield the records of games games of playable_games[game_key] of the
+    given size, between the strategies usable_strategies[p1_key] and
+    usable_strategies[p2_key], one at a time as each game ends.
+    """
+    p1_strategy = usable_strategies[p1_key]
+    p2_strategy = usable_strategies[p2_key]
+    for _ in range(games):
+        yield play_game(make_game(game_key, size, p1_starts),
+                        p1_strategy, p2_strategy)
+
+
+def write_records(records: Iterable[GameRecord], output: TextIO) -> None:
+    """
+    Write records to output, one line of JSON per game, each as soon as it
+    is produced.
+    """
+    for record in records:
+        output.write(record.to_json() + '\n')
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """
+    Play the games asked for by the command line arguments, writing the
+    record of each game as it ends if asked to, and report how many games
+    were played per second.
+    """
+    strategies = sorted(set(usable_strategies) - {'i'})
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('game', choices=sorted(SIZE_OPTIONS))
+    parser.add_argument('p1', choices=strategies)
+    parser.add_argument('p2', choices=strategies)
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--size', type=int, required=True,
+                        help='the starting total or side length')
+    parser.add_argument('--p2-starts', action='store_true')
+    parser.add_argument('--output', help='a file to write the records to')
+    args = parser.parse_args(arguments)
+
+    wins = {'p1': 0, 'p2': 0, None: 0}
+
+    def tally(records: Iterable[GameRecord]) -> Iterator[GameRecord]:
+        """
+        Yield records, counting the winner of each in wins on the way.
+        """
+        for record in records:
+            wins[record.winner] += 1
+            yield record
+
+    start = time.perf_counter()
+    records = tally(self_play(args.game, args.p1, args.p2, args.games,
+                              args.size, not args.p2_starts))
+    if args.output:
+        with open(args.output, 'w') as output:
+            write_records(records, output)
+    else:
+        for _ in records:
+            pass
+    seconds = time.perf_counter() - start
+
+    games = sum(wins.values())
+    print("{} games in {:.2f} seconds ({:.1f} games per second): "
+          "p1 won {}, p2 won {}.".format(
+              games, seconds, games / seconds if seconds else 0,
+              wins['p1'], wins['p2']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+A subset of unittests used for testing the headless self-play runner.
+
+These unittests only test for basic functionality. They are not a guarantee
+that the code works flawlessly.
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from game_interface import make_game, usable_strategies
+from self_play import (GameRecord, main, play_game, self_play,
+                       write_records)
+
+
+class SelfPlayUnitTests(unittest.TestCase):
+    @patch('builtins.input', side_effect=AssertionError("input() was called"))
+    def test_self_play_subtract_square(self, input):
+        """
+        Test that self-play between two minimax strategies on SubtractSquare
+        with a value of 18 ends every game with a win for Player 1, who can
+        force one, without printing anything.
+        """
+        with patch('builtins.print') as printed:
+            records = list(self_play('s', 'mr', 'ab', 3, 18))
+
+        self.assertFalse(printed.called,
+                         "Self-play should not print while it plays.")
+        self.assertEqual(len(records), 3)
+        for record in records:
+            self.assertEqual(record.winner, 'p1')
+            self.assertEqual(sum(record.moves), 18)
+            self.assertEqual(len(record.move_times), len(record.moves))
+
+    def test_play_game_stonehenge(self):
+        """
+        Test that a recorded game of Stonehenge replays to a finished game
+        with the recorded winner.
+        """
+        game = make_game('h', 3)
+        record = play_game(game, usable_strategies['ro'],
+                           usable_strategies['ab'])
+
+        replay = make_game('h', 3)
+        state = replay.current_state
+        for move in record.moves:
+            self.assertTrue(state.is_valid_move(move))
+            state = state.make_move(move)
+        self.assertTrue(replay.is_over(state))
+        self.assertEqual(replay.winner(state), record.winner)
+
+    def test_play_game_invalid_move(self):
+        """
+        Test that a strategy choosing an invalid move stops the game instead
+        of being asked again forever.
+        """
+        game = make_game('s', 5)
+        with self.assertRaises(ValueError):
+            play_game(game, lambda g: 3, lambda g: 1)
+
+    def test_write_records(self):
+        """
+        Test that records are written one line of JSON per game.
+        """
+        output = io.StringIO()
+        write_records([GameRecord([4], 'p1', [0.25]),
+                       GameRecord(['A'], 'p2', [0.5])], output)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1]),
+                         {'moves': ['A'], 'winner': 'p2', 'times': [0.5]})
+
+    def test_records_written_as_games_end(self):
+        """
+        Test that each record is written as soon as its game ends, before the
+        next game is played.
+        """
+        output = io.StringIO()
+        lines = []
+
+        def record_lines(records):
+            for record in records:
+                yield record
+                lines.append(len(output.getvalue().splitlines()))
+
+        write_records(record_lines(self_play('s', 'ro', 'ro', 3, 10)), output)
+        self.assertEqual(lines, [1, 2, 3])
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+
+    def test_main_writes_every_record(self):
+        """
+        Test that the command line writes one record per game to the output
+        file and reports every game in its summary.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.jsonl')
+            with patch('builtins.print') as printed:
+                main(['s', 'ro', 'ab', '--games', '4', '--size', '10',
+                      '--output', path])
+            with open(path) as output:
+                lines = output.read().splitlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(printed.call_args[0][0].startswith('4 games'))
+
+    def test_interactive_strategy_not_offered(self):
+        """
+        Test that the command line does not accept the interactive strategy,
+        which would wait for input in the middle of a headless run.
+        """
+        with patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['s', 'i', 'ro', '--size', '10'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+A transposition table in shared memory, for searches running in several
+processes at once.
+
+The table is a fixed number of slots, each two 64-bit words: the key
+XORed with the data, then the data. Processes read and write the slots
+without any locks. A slot torn by two processes writing it at once, or by
+a process stopped halfway through a write, no longer XORs back to its key,
+so it just reads as missing.
+
+NOTE: You do not have to run python_ta on this file.
+"""
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+_MASK = (1 << 64) - 1
+# The data word holds, from the lowest bits up: the value, the depth and the
+# best move index in 16 bits each, then a bit marking the slot as used.
+_VALUE_OFFSET = 1 << 15
+_NO_MOVE = 0xFFFF
+_USED = 1 << 48
+
+# The depth stored for values that are exact, however deep the search was
+EXACT_DEPTH = 0xFFFF
+
+
+class SharedTranspositionTable:
+    """
+    A fixed-size table from 64-bit position hashes to (value, depth, best
+    move index), kept in shared memory so every process that attaches to it
+    reads and writes the same entries.
+
+    It can also be used like the dict tables of strategy.py, keyed by game
+    states: table[state] = score stores an exact score under hash(state).
+
+    name - the name other processes attach to the table by
+    size - the number of slots
+    """
+    name: str
+    size: int
+
+    def __init__(self, size: int = 1 << 20,
+                 name: Optional[str] = None) -> None:
+        """
+        Create a new table of size empty slots, or attach to the existing
+        table called name if name is given.
+        """
+        self._words = None
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True,
+                                                      size=size * 16)
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+        self.name = self._memory.name
+        self.size = size
+        self._words = self._memory.buf.cast('Q')
+
+    def __reduce__(self) -> tuple:
+        """
+        Return how to pickle this table: by name, so a process that unpickles
+        it attaches to the same shared memory.
+        """
+        return SharedTranspositionTable, (self.size, self.name)
+
+    def store(self, key: int, value: int, depth: int = EXACT_DEPTH,
+              move_index: int = -1) -> None:
+        """
+        Store value, the depth it was searched to and the index of the best
+        move (or -1 if there is none) under the 64-bit hash key.
+
+        An entry for the same key that was searched deeper is kept instead.
+        An entry for another key in the same slot is replaced.
+
+        Precondition: -2**15 <= value < 2**15, 0 <= depth <= EXACT_DEPTH and
+        -1 <= move_index < 0xFFFF
+        """
+        key &= _MASK
+        slot = 2 * (key % self.size)
+        words = self._words
+        old_data = words[slot + 1]
+        if old_data & _USED and words[slot] ^ old_data == key and \
+                (old_data >> 16) & 0xFFFF > depth:
+            return
+        data = (_USED | (move_index & _NO_MOVE) << 32 | depth << 16 |
+                (value + _VALUE_OFFSET))
+        words[slot] = key ^ data
+        words[slot + 1] = data
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Return the (value, depth, best move index) stored under the 64-bit
+        hash key, or None if there is no intact entry for key.
+
+        >>> table = SharedTranspositionTable(8)
+        >>> table.store(12345, -1, 3, 2)
+        >>> table.probe(12345)
+        (-1, 3, 2)
+        >>> table.probe(12346) is None
+        True
+        >>> table.close()
+        >>> table.unlink()
+        """
+        key &= _MASK
+        slot = 2 * (key % self.size)
+        data = self._words[slot + 1]
+        if not data & _USED or self._words[slot] ^ data != key:
+            return None
+        move_index = (data >> 32) & _NO_MOVE
+        return ((data & 0xFFFF) - _VALUE_OFFSET, (data >> 16) & 0xFFFF,
+                -1 if move_index == _NO_MOVE else move_index)
+
+    def get(self, state: Any, default: Any = None) -> Any:
+        """
+        Return the exact score stored for state, or default if there is none.
+        """
+        entry = self.probe(hash(state))
+        if entry is None or entry[1] != EXACT_DEPTH:
+            return default
+        return entry[0]
+
+    def __setitem__(self, state: Any, score: int) -> None:
+        """
+        Store score as the exact score of state.
+        """
+        self.store(hash(state), score)
+
+    def clear(self) -> None:
+        """
+        Empty every slot of the table.
+        """
+        self._memory.buf[:] = bytes(len(self._memory.buf))
+
+    def __del__(self) -> None:
+        """
+        Detach this process from the table when the table is dropped, such
+        as by a worker process that was handed it pickled.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Detach this process from the table. The table itself stays until
+        unlink() is called. Closing a table a second time does nothing.
+        """
+        if self._words is None:
+            return
+        self._words.release()
+        self._words = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory of the table, once every process has closed
+        it.
+        """
+        self._memory.unlink()
@@ -0,0 +1,121 @@
+"""
+A subset of unittests used for testing the shared-memory transposition
+table.
+
+These unittests only test for basic functionality. They are not a guarantee
+that the code works flawlessly.
+"""
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from multiprocessing import Pool
+
+from game_interface import make_game, usable_strategies
+from shared_table import EXACT_DEPTH, SharedTranspositionTable
+from strategy import minimax_parallel
+
+
+def store_squares(job):
+    """
+    Store i * i % 1000 under the key i for every i in range(start, stop),
+    where job is (table, start, stop).
+    """
+    table, start, stop = job
+    for i in range(start, stop):
+        table.store(i, i * i % 1000, 1, i % 7)
+    return stop - start
+
+
+class SharedTranspositionTableUnitTests(unittest.TestCase):
+    def setUp(self):
+        self.table = SharedTranspositionTable(1024)
+
+    def tearDown(self):
+        self.table.close()
+        self.table.unlink()
+
+    def test_store_and_probe(self):
+        """
+        Test that entries are read back as stored, that a shallower entry
+        for the same key does not replace a deeper one, and that another key
+        in the same slot does.
+        """
+        self.table.store(2 ** 64 - 1, -1, 4, 3)
+        self.assertEqual(self.table.probe(2 ** 64 - 1), (-1, 4, 3))
+        self.table.store(2 ** 64 - 1, 1, 2)
+        self.assertEqual(self.table.probe(2 ** 64 - 1), (-1, 4, 3))
+        self.table.store(2 ** 64 - 1, 1, EXACT_DEPTH)
+        self.assertEqual(self.table.probe(2 ** 64 - 1), (1, EXACT_DEPTH, -1))
+
+        other = 2 ** 64 - 1 - 1024
+        self.table.store(other, 0, 0)
+        self.assertEqual(self.table.probe(other), (0, 0, -1))
+        self.assertIsNone(self.table.probe(2 ** 64 - 1))
+
+    def test_torn_entry_reads_as_missing(self):
+        """
+        Test that a slot whose two words do not belong together, as after
+        an interrupted write, reads as missing.
+        """
+        self.table.store(77, 1, 5, 0)
+        self.table._words[2 * 77 + 1] ^= 1 << 20
+        self.assertIsNone(self.table.probe(77))
+
+    def test_shared_between_processes(self):
+        """
+        Test that entries written by worker processes, which get the table
+        pickled by name, are read by this process.
+        """
+        copy = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(copy.name, self.table.name)
+        copy.close()
+
+        with Pool(2) as pool:
+            stored = pool.map(store_squares, [(self.table, 0, 500),
+                                              (self.table, 500, 1000)])
+        self.assertEqual(sum(stored), 1000)
+        for i in range(1000):
+            self.assertEqual(self.table.probe(i), (i * i % 1000, 1, i % 7))
+
+    def test_workers_detach_cleanly(self):
+        """
+        Test that worker processes which drop the table without closing it
+        detach from it without printing any errors.
+        """
+        script = ("from multiprocessing import Pool\n" +
+                  "from shared_table import SharedTranspositionTable\n" +
+                  "from shared_table_unittest_basic import store_squares\n" +
+                  "table = SharedTranspositionTable(1024)\n" +
+                  "with Pool(2) as pool:\n" +
+                  "    pool.map(store_squares, [(table, 0, 10)] * 8)\n" +
+                  "table.close()\n" +
+                  "table.close()\n" +
+                  "table.unlink()\n")
+        result = subprocess.run([sys.executable, '-c', script],
+                                capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr, '',
+                         "The workers printed errors:\n" + result.stderr)
+
+    def test_parallel_minimax_with_table(self):
+        """
+        Test that parallel minimax given a table fills it with exact scores
+        of states, and chooses the same move as recursive minimax when the
+        table is reused.
+        """
+        game = make_game('h', 2)
+        game.current_state = game.current_state.make_move('B')
+        expected = usable_strategies['mr'](game)
+
+        for _ in range(2):
+            self.assertEqual(minimax_parallel(game, 2, self.table), expected)
+        child = game.current_state.make_move(expected)
+        self.assertIn(self.table.get(child), [-1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,689 +1,526 @@
-"""
-An implementation of Stonehenge Game.
-"""
-from typing import Any
-from game import Game
-from game_state import GameState
-
-class StonehengeGame(Game):
-    """
-    Abstract class for a game to be played with two players.
-    """
-    def __init__(self, p1_starts):
-        """
-        Initialize this Game, using p1_starts to find who the first player is.
-
-        :param p1_starts: A boolean representing whether Player 1 is the first
-                          to make a move.
-        :type p1_starts: bool
-        """
-        length = int(input("Enter the side length of the board: "))
-        self.current_state = StonehengeState(p1_starts, length)
-
-    def get_instructions(self):
-        """
-        Return the instructions for this Game.
-
-        :return: The instructions for this Game.
-        :rtype: str
-        """
-        instructions = "Players take turns claiming cells . When a player " \
-                       "captures at least half " \
-                       "of the cells in a ley-line, then the player captures " \
-                       "that ley-line. The first " \
-                       "player to capture at least half of the ley-lines is " \
-                       "the winner. A ley-line, " \
-                       "once claimed, cannot be taken by the other player"
-        return instructions
-
-    def is_over(self, state):
-        """
-        Return whether or not this game is over.
-
-        :return: True if the game is over, False otherwise.
-        :rtype: bool
-        """
-        all_ley = (3 * (state.length) + 3)
-        least_ley = int(all_ley / 2) + (all_ley % 2 > 0)
-
-        p1_score = 0
-        p2_score = 0
-        for i in state.init_ley:
-            if state.init_ley[i] == "1":
-                p1_score += 1
-            elif state.init_ley[i] == "2":
-                p2_score += 1
-
-
-        return (p2_score >= least_ley) or (p1_score >= least_ley)
-
-    def is_winner(self, player):
-        """
-        Return whether player has won the game.
-
-        Precondition: player is 'p1' or 'p2'.
-
-        :param player: The player to check.
-        :type player: str
-        :return: Whether player has won or not.
-        :rtype: bool
-        """
-        p1_score = 0
-        p2_score = 0
-        for i in self.current_state.init_ley:
-            if self.current_state.init_ley[i] == "1":
-                p1_score += 1
-            elif self.current_state.init_ley[i] == "2":
-                p2_score += 1
-
-        if player == 'p1' and \
-                self.current_state.get_current_player_name() == 'p2' \
-                and self.is_over(self.current_state) and \
-                p2_score < p1_score:
-            return True
-        elif player == 'p2' and \
-                self.current_state.get_current_player_name() == 'p1' \
-                and self.is_over(self.current_state) and \
-                p2_score > p1_score:
-            return True
-        return False
-
-    def str_to_move(self, string):
-        """
-        Return the move that string represents. If string is not a move,
-        return an invalid move.
-
-        :param string:
-        :type string:
-        :return: string
-        :rtype: str
-        """
-        if not string.strip().isalpha():
-            return -1
-        return string.strip().upper()
-
-
-
-
-class StonehengeState(GameState):
-    """
-    The state of a game at a certain point in time.
-    """
-
-    def __init__(self, is_p1_turn: bool, length: int) -> None:
-        """
-        Initialize this game state and set the current player based on
-        is_p1_turn.
-        """
-        super().__init__(is_p1_turn)
-        self.length = length
-
-        if self.length == 1:
-            self.init_alpha = {'A': 'A', 'B': 'B', 'C': 'C'}
-            self.init_ley = {'/1': '@', '/2': '@',
-                             '\1': '@', '\2': '@',
-                             '-1': '@', '-2': '@'}
-
-        elif self.length == 2:
-            self.init_alpha = {'A': 'A', 'B': 'B', 'C': 'C',
-                               'D': 'D', 'E': 'E', 'F': 'F',
-                               'G': 'G'}
-            self.init_ley = {'/1': '@', '/2': '@', '/3': '@',
-                             '\1': '@', '\2': '@', '\3': '@',
-                             '-1': '@', '-2': '@', '-3': '@'}
-
-        elif self.length == 3:
-            self.init_alpha = {'A': 'A', 'B': 'B', 'C': 'C',
-                               'D': 'D', 'E': 'E', 'F': 'F',
-                               'G': 'G', 'H': 'H', 'I': 'I',
-                               'J': 'J', 'K': 'K', 'L': 'L'}
-            self.init_ley = {'/1': '@', '/2': '@', '/3': '@', '/4': '@',
-                             '\1': '@', '\2': '@', '\3': '@', '\4': '@',
-                             '-1': '@', '-2': '@', '-3': '@', '-4': '@'}
-
-        elif self.length == 4:
-            self.init_alpha = {'A': 'A', 'B': 'B', 'C': 'C', 'D': 'D',
-                               'E': 'E', 'F': 'F', 'G': 'G', 'H': 'H', 'I': 'I',
-                               'J': 'J', 'K': 'K', 'L': 'L', 'M': 'M',
-                               'N': 'N', 'O': 'O', 'P': 'P', 'Q': 'Q', 'R': 'R'}
-            self.init_ley = {'/1': '@', '/2': '@', '/3': '@',
-                             '/4': '@', '/5': '@',
-                             '\1': '@', '\2': '@', '\3': '@',
-                             '\4': '@', '\5': '@',
-                             '-1': '@', '-2': '@', '-3': '@',
-                             '-4': '@', '-5': '@'}
-        else:
-            self.init_alpha = {'A': 'A', 'B': 'B', 'C': 'C', 'D': 'D',
-                               'E': 'E', 'F': 'F', 'G': 'G', 'H': 'H', 'I': 'I',
-                               'J': 'J', 'K': 'K', 'L': 'L', 'M': 'M',
-                               'N': 'N', 'O': 'O', 'P': 'P', 'Q': 'Q', 'R': 'R',
-                               'S': 'S', 'T': 'T', 'U': 'U', 'V': 'V',
-                               'W': 'W', 'X': 'X', 'Y': 'Y'}
-
-            self.init_ley = {'/1': '@', '/2': '@', '/3': '@',
-                             '/4': '@', '/5': '@', '/6': '@',
-                             '\1': '@', '\2': '@', '\3': '@',
-                             '\4': '@', '\5': '@', '\6': '@',
-                             '-1': '@', '-2': '@', '-3': '@',
-                             '-4': '@', '-5': '@', '-6': '@'}
-
-
-    def __str__(self) -> str:
-        """
-        Return a string representation of the current state of the game.
-        >>> s = StonehengeState(True, 2)
-        >>> print(s)
-        """
-        if self.length == 1:
-            return "      "+ self.init_ley['/1'] + \
-                   "   " + self.init_ley['/2'] + "\n" + \
-                   '     ' + '/' + '   ' + '/' + "\n" + \
-                   self.init_ley['-1'] + " - " + \
-                   self.init_alpha['A'] + " - " + \
-                   self.init_alpha['B'] + "\n" + \
-                   "     " + "\\" + " /" + " \\" + " \n" + \
-                   "  " + self.init_ley['-2'] + " - " + \
-                   self.init_alpha['C'] + "   " + \
-                   self.init_ley['\2'] + "\n" + \
-                   "       " + "\\" + " \n" + \
-                   "        " + self.init_ley['\1']
-
-        elif self.length == 2:
-            return "        " + self.init_ley['/1'] + "   " + \
-                   self.init_ley['/2'] + "\n" + \
-                   "       /   / \n" + \
-                   "  " + self.init_ley['-1'] + " - " + \
-                   self.init_alpha['A'] + " - " + \
-                   self.init_alpha['B'] \
-                   + "   " + self.init_ley['/3'] + "\n" + \
-                   "     " + "/" + " " + "\\" + " /" + " " + \
-                   "\\" + " " + "/" + " \n" + \
-                   self.init_ley['-2'] + " - " + \
-                   self.init_alpha['C'] + " - " + self.init_alpha['D'] + \
-                   " - " + self.init_alpha['E'] + "\n" + \
-                   "     " + "\\" + " " + "/" + " " + "\\" + " " + \
-                   "/" + " " + "\\" + " \n" + \
-                   "  " + self.init_ley['-3'] + " - " + \
-                   self.init_alpha['F'] + " - " + self.init_alpha['G'] \
-                   + "   " + self.init_ley['\3'] + "\n" + \
-                   "       " + "\\" + "   " + "\\" + " \n" + \
-                   "        " + self.init_ley['\1'] + "   " + \
-                   self.init_ley['\2']
-
-        elif self.length == 3:
-            return "          " + self.init_ley['/1'] + "   " + \
-                   self.init_ley['/2'] + "\n" + \
-                   "         /   / \n" + \
-                   "    " + self.init_ley['-1'] + " - " + \
-                   self.init_alpha['A'] + " - " + self.init_alpha['B'] \
-                   + "   " + self.init_ley['/3'] + "\n" + \
-                   "       / \ / \ / \n" + \
-                   "  " + self.init_ley['-2'] + " - " + \
-                   self.init_alpha['C'] + " - " + self.init_alpha['D'] + \
-                   " - " + self.init_alpha['E'] + "   " + \
-                   self.init_ley['/4'] + "\n" + \
-                   "     " + "/" + " \ / \ / \ / \n" + \
-                   self.init_ley['-3'] + " - " + \
-                   self.init_alpha['F'] + " - " + self.init_alpha['G'] \
-                   + " - " + self.init_alpha['H'] + " - " + \
-                   self.init_alpha['I'] + "\n" + \
-                   "     \ / \ / \ / \ \n" + \
-                   "  " + self.init_ley['-4'] + " - " + \
-                   self.init_alpha['J'] + " - " + self.init_alpha['K'] \
-                   + " - " + self.init_alpha['L'] + "   " + \
-                   self.init_ley['\4'] + "\n" + \
-                   "       \   \   \ \n" + \
-                   "        " + self.init_ley['\1'] + "   " + \
-                   self.init_ley['\2'] + "   " + self.init_ley['\3']
-
-        elif self.length == 4:
-            return "            " + self.init_ley['/1'] + "   " + \
-                   self.init_ley['/2'] + "\n" + \
-                   "           /   / \n" + \
-                   "      " + self.init_ley['-1'] + " - " + \
-                   self.init_alpha['A'] + " - " + self.init_alpha['B'] \
-                   + "   " + self.init_ley['/3'] + "\n" + \
-                   "         / \ / \ / \n" + \
-                   "    " + self.init_ley['-2'] + " - " + \
-                   self.init_alpha['C'] + " - " + self.init_alpha['D'] + \
-                   " - " + self.init_alpha['E'] + "   " + \
-                   self.init_ley['/4'] + "\n" + \
-                   "       / \ / \ / \ / \n" + \
-                   "  " + self.init_ley['-3'] + " - " + \
-                   self.init_alpha['F'] + " - " + self.init_alpha['G'] \
-                   + " - " + self.init_alpha['H'] + " - " + \
-                   self.init_alpha['I'] + "   " + \
-                   self.init_ley['/5'] + "\n" + \
-                   "     / \ / \ / \ / \ / \n" + \
-                   self.init_ley['-4'] + " - " + self.init_alpha['J'] + \
-                   " - " + self.init_alpha['K'] \
-                   + " - " + self.init_alpha['L'] + " - " + \
-                   self.init_alpha['M'] + " - " + \
-                   self.init_alpha['N'] + "\n" + \
-                   "     \ / \ / \ / \ / \ \n" + \
-                   "  " + self.init_ley['-5'] + " - " + \
-                   self.init_alpha['O'] + " - " + self.init_alpha['P'] + \
-                   " - " + \
-                   self.init_alpha['Q'] + " - " + self.init_alpha['R'] + \
-                   "   " + self.init_ley['\5'] + "\n" \
-                   + "       \   \   \   \ \n" + \
-                   "        " + self.init_ley['\1'] + "   " + \
-                   self.init_ley['\2'] + "   " + self.init_ley['\3'] \
-                   + "   " + self.init_ley['\4']
-
-        return "              " + self.init_ley['/1'] + "   " + \
-               self.init_ley['/2'] + "\n" + \
-               "             /   / \n" + \
-               "        " + self.init_ley['-1'] + " - " + \
-               self.init_alpha['A'] + " - " + self.init_alpha['B'] \
-               + "   " + self.init_ley['/3'] + "\n" + \
-               "           / \ / \ / \n" + \
-               "      " + self.init_ley['-2'] + " - " + \
-               self.init_alpha['C'] + " - " + self.init_alpha['D'] + \
-               " - " + self.init_alpha['E'] + "   " + \
-               self.init_ley['/4'] + "\n" + \
-               "         / \ / \ / \ / \n" + \
-               "    " + self.init_ley['-3'] + " - " + \
-               self.init_alpha['F'] + " - " + self.init_alpha['G'] \
-               + " - " + self.init_alpha['H'] + " - " + \
-               self.init_alpha['I'] + "   " + self.init_ley['/5'] + "\n" + \
-               "       / \ / \ / \ / \ / \n" + \
-               "  " + self.init_ley['-4'] + " - " + \
-               self.init_alpha['J'] + " - " + self.init_alpha['K'] \
-               + " - " + self.init_alpha['L'] + " - " + \
-               self.init_alpha['M'] + " - " \
-               + self.init_alpha['N'] + "   " + \
-               self.init_ley['/6'] + "\n" + \
-               "     / \ / \ / \ / \ / \ / \n" + \
-               self.init_ley['-5'] + " - " + self.init_alpha['O'] + \
-               " - " + self.init_alpha['P'] + " - " + \
-               self.init_alpha['Q'] + " - " + self.init_alpha['R'] + \
-               " - " + \
-               self.init_alpha['S'] + " - " + self.init_alpha['T'] + \
-               "\n" \
-               + "     \ / \ / \ / \ / \ / \ \n" + \
-               "  " + self.init_ley['-6'] + " - " + \
-               self.init_alpha['U'] + " - " + self.init_alpha['V'] + \
-               " - " + self.init_alpha['W'] + " - " + \
-               self.init_alpha['X'] + " - " + \
-               self.init_alpha['Y'] + "   " + \
-               self.init_ley['\6'] + "\n" + \
-               "       \   \   \   \   \ \n" + \
-               "        " + self.init_ley['\1'] + "   " + \
-               self.init_ley['\2'] + "   " + self.init_ley['\3'] \
-               + "   " + self.init_ley['\4'] + "   " +\
-               self.init_ley['\5']
-
-    def get_possible_moves(self) -> list:
-        """
-        Return all possible moves that can be applied to this state.
-
-        >>> s = StonehengeState(True, 1)
-        >>> s.get_possible_moves()
-        ['A', 'B', 'C']
-        >>> s.init_alpha['A'] = str(2)
-        >>> s.get_possible_moves()
-        ['B', 'C']
-        >>> s = StonehengeState(True, 2)
-        >>> s.init_alpha['B'] = str(1)
-        >>> s.init_alpha['K'] = str(2)
-        >>> s.get_possible_moves()
-        ['A', 'C', 'D', 'E', 'F', 'G']
-        """
-        all_ley = (3 * (self.length) + 3)
-        least_ley = int(all_ley / 2) + (all_ley % 2 > 0)
-
-        p1_score = 0
-        p2_score = 0
-        for i in self.init_ley:
-            if self.init_ley[i] == "1":
-                p1_score += 1
-            elif self.init_ley[i] == "2":
-                p2_score += 1
-
-        if (p2_score >= least_ley) or (p1_score >= least_ley):
-            return []
-
-        return [self.init_alpha[a] for a
-                in self.init_alpha if (self.init_alpha[a]
-                                       != str(2) and
-                                       self.init_alpha[a] != str(1))]
-
-
-    def make_move(self, move: Any) -> "StonehengeState":
-        """
-        Return the GameState that results from applying move to this GameState.
-        """
-        if type(move) == str:
-            move.upper()
-
-        new_init_alpha = self.init_alpha.copy()
-        new_init_ley = self.init_ley.copy()
-        if self.p1_turn:
-            player_no = "1"
-        else:
-            player_no = "2"
-
-        for a in new_init_alpha:
-            if new_init_alpha[a] == move:
-                new_init_alpha[a] = player_no
-
-        new_state = StonehengeState(not self.p1_turn, self.length)
-        new_state.init_alpha = new_init_alpha
-        new_state.init_ley = new_init_ley
-
-        if new_state.length == 1:
-            if (new_state.init_alpha['A'] == player_no) and \
-                    new_state.init_ley['/1'] == '@':
-                new_state.init_ley['/1'] = player_no
-            if (new_state.init_alpha['B'] == player_no or
-                    new_state.init_alpha['C'] == player_no) and \
-                    new_state.init_ley['/2'] == '@':
-                new_state.init_ley['/2'] = player_no
-            if (new_state.init_alpha['B'] == player_no or
-                    new_state.init_alpha['A'] == player_no) \
-                    and new_state.init_ley['-1'] == '@':
-                new_state.init_ley['-1'] = player_no
-            if (new_state.init_alpha['C'] == player_no) and \
-                    new_state.init_ley['-2'] == '@':
-                new_state.init_ley['-2'] = player_no
-            if (new_state.init_alpha['A'] == player_no or
-                    new_state.init_alpha['C'] == player_no) \
-                    and new_state.init_ley['\1'] == '@':
-                new_state.init_ley['\1'] = player_no
-            if (new_state.init_alpha['B'] == player_no) and \
-                    new_state.init_ley['\2'] == '@':
-                new_state.init_ley['\2'] = player_no
-
-        elif new_state.length == 2:
-            if (new_state.init_alpha['A'] == player_no or
-                    new_state.init_alpha['C'] == player_no) \
-                    and new_state.init_ley['/1'] == '@':
-                new_state.init_ley['/1'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['D'],
-                 new_state.init_alpha['F']].count(player_no) >= 2) and \
-                    new_state.init_ley['/2'] == '@':
-                new_state.init_ley['/2'] = player_no
-            if (new_state.init_alpha['E'] == player_no or
-                    new_state.init_alpha['G'] == player_no) and \
-                    new_state.init_ley['/3'] == '@':
-                new_state.init_ley['/3'] = player_no
-            if (new_state.init_alpha['A'] == player_no or
-                    new_state.init_alpha['B'] == player_no) \
-                    and new_state.init_ley['-1'] == '@':
-                new_state.init_ley['-1'] = player_no
-            if ([new_state.init_alpha['C'],
-                 new_state.init_alpha['D'], new_state.init_alpha['E']].count(
-                     player_no) >= 2) and new_state.init_ley['-2'] == '@':
-                new_state.init_ley['-2'] = player_no
-            if (new_state.init_alpha['F'] == player_no or
-                    new_state.init_alpha['G'] == player_no) and \
-                    new_state.init_ley['-3'] == '@':
-                new_state.init_ley['-3'] = player_no
-            if (new_state.init_alpha['C'] == player_no or
-                    new_state.init_alpha['F'] == player_no) and \
-                    new_state.init_ley['\1'] == '@':
-                new_state.init_ley['\1'] = player_no
-            if ([new_state.init_alpha['A'], new_state.init_alpha['D'],
-                 new_state.init_alpha['G']].count(
-                     player_no) >= 2) and new_state.init_ley['\2'] == '@':
-                new_state.init_ley['\2'] = player_no
-            if (new_state.init_alpha['B'] == player_no or
-                    new_state.init_alpha['E'] == player_no) and \
-                    new_state.init_ley['\3'] == '@':
-                new_state.init_ley['\3'] = player_no
-
-        elif new_state.length == 3:
-            if ([new_state.init_alpha['A'], new_state.init_alpha['C'],
-                 new_state.init_alpha['F']].count(player_no) >= 2) and \
-                    new_state.init_ley['/1'] == '@':
-                new_state.init_ley['/1'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['D'],
-                 new_state.init_alpha['G'],
-                 new_state.init_alpha['J']].count(player_no) >= 2) and \
-                    new_state.init_ley['/2'] == '@':
-                new_state.init_ley['/2'] = player_no
-            if ([new_state.init_alpha['E'], new_state.init_alpha['H'],
-                 new_state.init_alpha['K']].count(player_no) >= 2) and \
-                    new_state.init_ley['/3'] == '@':
-                new_state.init_ley['/3'] = player_no
-            if ([new_state.init_alpha['I'],
-                 new_state.init_alpha['L']].count(player_no) >= 1) and \
-                    new_state.init_ley['/4'] == '@':
-                new_state.init_ley['/4'] = player_no
-
-            if ([new_state.init_alpha['A'],
-                 new_state.init_alpha['B']].count(player_no) >= 1)  \
-                    and new_state.init_ley['-1'] == '@':
-                new_state.init_ley['-1'] = player_no
-            if ([new_state.init_alpha['C'], new_state.init_alpha['D'],
-                 new_state.init_alpha['E']].count(player_no) >= 2) and \
-                    new_state.init_ley['-2'] == '@':
-                new_state.init_ley['-2'] = player_no
-            if ([new_state.init_alpha['F'], new_state.init_alpha['G'],
-                 new_state.init_alpha['H'],
-                 new_state.init_alpha['I']].count(player_no) >= 2) and \
-                    new_state.init_ley['-3'] == '@':
-                new_state.init_ley['-3'] = player_no
-            if ([new_state.init_alpha['J'], new_state.init_alpha['K'],
-                 new_state.init_alpha['L']].count(player_no) >= 2) and \
-                    new_state.init_ley['-4'] == '@':
-                new_state.init_ley['-4'] = player_no
-
-            if ([new_state.init_alpha['F'],
-                 new_state.init_alpha['J']].count(player_no) >= 1) and \
-                    new_state.init_ley['\1'] == '@':
-                new_state.init_ley['\1'] = player_no
-            if ([new_state.init_alpha['C'], new_state.init_alpha['G'],
-                 new_state.init_alpha['K']].count(player_no) >= 2) and \
-                    new_state.init_ley['\2'] == '@':
-                new_state.init_ley['\2'] = player_no
-            if ([new_state.init_alpha['A'], new_state.init_alpha['D'],
-                 new_state.init_alpha['H'],
-                 new_state.init_alpha['L']].count(player_no) >= 2) and \
-                    new_state.init_ley['\3'] == '@':
-                new_state.init_ley['\3'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['E'],
-                 new_state.init_alpha['I']].count(player_no) >= 2) and \
-                    new_state.init_ley['\4'] == '@':
-                new_state.init_ley['\4'] = player_no
-
-        elif new_state.length == 4:
-            if ([new_state.init_alpha['A'],
-                 new_state.init_alpha['C'], new_state.init_alpha['F'],
-                 new_state.init_alpha['J']].count(player_no) >= 2) and \
-                    new_state.init_ley['/1'] == '@':
-                new_state.init_ley['/1'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['D'],
-                 new_state.init_alpha['G'],
-                 new_state.init_alpha['K'],
-                 new_state.init_alpha['O']].count(player_no) >= 3) and \
-                    new_state.init_ley['/2'] == '@':
-                new_state.init_ley['/2'] = player_no
-            if ([new_state.init_alpha['E'],
-                 new_state.init_alpha['H'], new_state.init_alpha['L'],
-                 new_state.init_alpha['P']].count(player_no) >= 2) and \
-                    new_state.init_ley['/3'] == '@':
-                new_state.init_ley['/3'] = player_no
-            if ([new_state.init_alpha['I'], new_state.init_alpha['M'],
-                 new_state.init_alpha['Q']].count(player_no) >= 2) and \
-                    new_state.init_ley['/4'] == '@':
-                new_state.init_ley['/4'] = player_no
-            if ([new_state.init_alpha['N'],
-                 new_state.init_alpha['R']].count(player_no) >= 1) and \
-                    new_state.init_ley['/5'] == '@':
-                new_state.init_ley['/5'] = player_no
-
-            if ([new_state.init_alpha['A'],
-                 new_state.init_alpha['B']].count(player_no) >= 1)  \
-                    and new_state.init_ley['-1'] == '@':
-                new_state.init_ley['-1'] = player_no
-            if ([new_state.init_alpha['C'],
-                 new_state.init_alpha['D'],
-                 new_state.init_alpha['E']].count(player_no) >= 2) and \
-                    new_state.init_ley['-2'] == '@':
-                new_state.init_ley['-2'] = player_no
-            if ([new_state.init_alpha['F'], new_state.init_alpha['G'],
-                 new_state.init_alpha['H'],
-                 new_state.init_alpha['I']].count(player_no) >= 2) and \
-                    new_state.init_ley['-3'] == '@':
-                new_state.init_ley['-3'] = player_no
-            if ([new_state.init_alpha['J'], new_state.init_alpha['K'],
-                 new_state.init_alpha['L'],
-                 new_state.init_alpha['M'],
-                 new_state.init_alpha['N']].count(player_no) >= 3) and \
-                    new_state.init_ley['-4'] == '@':
-                new_state.init_ley['-4'] = player_no
-            if ([new_state.init_alpha['O'], new_state.init_alpha['P'],
-                 new_state.init_alpha['Q'],
-                 new_state.init_alpha['R']].count(player_no) >= 2) and \
-                    new_state.init_ley['-5'] == '@':
-                new_state.init_ley['-5'] = player_no
-
-            if ([new_state.init_alpha['J'],
-                 new_state.init_alpha['O']].count(player_no) >= 1) and \
-                    new_state.init_ley['\1'] == '@':
-                new_state.init_ley['\1'] = player_no
-            if ([new_state.init_alpha['F'],
-                 new_state.init_alpha['K'],
-                 new_state.init_alpha['P']].count(player_no) >= 2) and \
-                    new_state.init_ley['\2'] == '@':
-                new_state.init_ley['\2'] = player_no
-            if ([new_state.init_alpha['C'], new_state.init_alpha['G'],
-                 new_state.init_alpha['L'],
-                 new_state.init_alpha['Q']].count(player_no) >= 2) and \
-                    new_state.init_ley['\3'] == '@':
-                new_state.init_ley['\3'] = player_no
-            if ([new_state.init_alpha['A'], new_state.init_alpha['D'],
-                 new_state.init_alpha['H'],
-                 new_state.init_alpha['M'],
-                 new_state.init_alpha['R']].count(player_no) >= 3) and \
-                    new_state.init_ley['\4'] == '@':
-                new_state.init_ley['\4'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['E'],
-                 new_state.init_alpha['I'],
-                 new_state.init_alpha['N']].count(player_no) >= 2) and \
-                    new_state.init_ley['\5'] == '@':
-                new_state.init_ley['\5'] = player_no
-
-        else:
-            if ([new_state.init_alpha['A'], new_state.init_alpha['C'],
-                 new_state.init_alpha['F'],
-                 new_state.init_alpha['J'],
-                 new_state.init_alpha['O']].count(player_no) >= 3) and \
-                    new_state.init_ley['/1'] == '@':
-                new_state.init_ley['/1'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['D'],
-                 new_state.init_alpha['G'],
-                 new_state.init_alpha['K'], new_state.init_alpha['P'],
-                 new_state.init_alpha['U']].count(player_no) >= 3) and \
-                    new_state.init_ley['/2'] == '@':
-                new_state.init_ley['/2'] = player_no
-            if ([new_state.init_alpha['E'], new_state.init_alpha['H'],
-                 new_state.init_alpha['L'],
-                 new_state.init_alpha['Q'],
-                 new_state.init_alpha['V']].count(player_no) >= 3) and \
-                    new_state.init_ley['/3'] == '@':
-                new_state.init_ley['/3'] = player_no
-            if ([new_state.init_alpha['I'], new_state.init_alpha['M'],
-                 new_state.init_alpha['R'],
-                 new_state.init_alpha['W']].count(player_no) >= 2) and \
-                    new_state.init_ley['/4'] == '@':
-                new_state.init_ley['/4'] = player_no
-            if ([new_state.init_alpha['N'], new_state.init_alpha['S'],
-                 new_state.init_alpha['X']].count(player_no) >= 2) and \
-                    new_state.init_ley['/5'] == '@':
-                new_state.init_ley['/5'] = player_no
-            if ([new_state.init_alpha['T'],
-                 new_state.init_alpha['Y']].count(player_no) >= 1) and \
-                    new_state.init_ley['/6'] == '@':
-                new_state.init_ley['/6'] = player_no
-
-            if ([new_state.init_alpha['A'],
-                 new_state.init_alpha['B']].count(player_no) >= 1)  \
-                    and new_state.init_ley['-1'] == '@':
-                new_state.init_ley['-1'] = player_no
-            if ([new_state.init_alpha['C'], new_state.init_alpha['D'],
-                 new_state.init_alpha['E']].count(player_no) >= 2) and \
-                    new_state.init_ley['-2'] == '@':
-                new_state.init_ley['-2'] = player_no
-            if ([new_state.init_alpha['F'], new_state.init_alpha['G'],
-                 new_state.init_alpha['H'],
-                 new_state.init_alpha['I']].count(player_no) >= 2) and \
-                    new_state.init_ley['-3'] == '@':
-                new_state.init_ley['-3'] = player_no
-            if ([new_state.init_alpha['J'], new_state.init_alpha['K'],
-                 new_state.init_alpha['L'],
-                 new_state.init_alpha['M'],
-                 new_state.init_alpha['N']].count(player_no) >= 3) and \
-                    new_state.init_ley['-4'] == '@':
-                new_state.init_ley['-4'] = player_no
-            if ([new_state.init_alpha['O'], new_state.init_alpha['P'],
-                 new_state.init_alpha['Q'],
-                 new_state.init_alpha['R'], new_state.init_alpha['S'],
-                 new_state.init_alpha['T']].count(player_no) >= 3) and \
-                    new_state.init_ley['-5'] == '@':
-                new_state.init_ley['-5'] = player_no
-            if ([new_state.init_alpha['U'], new_state.init_alpha['V'],
-                 new_state.init_alpha['W'],
-                 new_state.init_alpha['X'],
-                 new_state.init_alpha['Y']].count(player_no) >= 3) and \
-                    new_state.init_ley['-6'] == '@':
-                new_state.init_ley['-6'] = player_no
-
-            if ([new_state.init_alpha['O'],
-                 new_state.init_alpha['U']].count(player_no) >= 1) and \
-                    new_state.init_ley['\1'] == '@':
-                new_state.init_ley['\1'] = player_no
-            if ([new_state.init_alpha['J'], new_state.init_alpha['P'],
-                 new_state.init_alpha['V']].count(player_no) >= 2) and \
-                    new_state.init_ley['\2'] == '@':
-                new_state.init_ley['\2'] = player_no
-            if ([new_state.init_alpha['F'], new_state.init_alpha['K'],
-                 new_state.init_alpha['Q'],
-                 new_state.init_alpha['W']].count(player_no) >= 2) and \
-                    new_state.init_ley['\3'] == '@':
-                new_state.init_ley['\3'] = player_no
-            if ([new_state.init_alpha['C'], new_state.init_alpha['G'],
-                 new_state.init_alpha['L'],
-                 new_state.init_alpha['R'],
-                 new_state.init_alpha['X']].count(player_no) >= 3) and \
-                    new_state.init_ley['\4'] == '@':
-                new_state.init_ley['\4'] = player_no
-            if ([new_state.init_alpha['A'], new_state.init_alpha['D'],
-                 new_state.init_alpha['H'],
-                 new_state.init_alpha['M'], new_state.init_alpha['S'],
-                 new_state.init_alpha['Y']].count(player_no) >= 3) and \
-                    new_state.init_ley['\5'] == '@':
-                new_state.init_ley['\5'] = player_no
-            if ([new_state.init_alpha['B'], new_state.init_alpha['E'],
-                 new_state.init_alpha['I'],
-                 new_state.init_alpha['N'],
-                 new_state.init_alpha['T']].count(player_no) >= 3) and \
-                    new_state.init_ley['\5'] == '@':
-                new_state.init_ley['\5'] = player_no
-
-
-        return new_state
-
-
-
-    def __repr__(self) -> str:
-        """
-        Return a representation of this state (which can be used for
-        equality testing).
-        """
-        pass
-
-    def rough_outcome(self) -> float:
-        """
-        Return an estimate in interval [LOSE, WIN] of best outcome the current
-        player can guarantee from state self.
-        """
-        pass
-
-
-
-if __name__ == "__main__":
-    from python_ta import check_all
-    check_all(config="a2_pyta.txt")
+"""
+An implementation of Stonehenge Game.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from game import Game
+from game_state import GameState
+from stonehenge_geometry import StonehengeGeometry, code_length, get_geometry
+
+class StonehengeGame(Game):
+    """
+    Abstract class for a game to be played with two players.
+    """
+    def __init__(self, p1_starts, length=None):
+        """
+        Initialize this Game, using p1_starts to find who the first player is.
+        The user is asked for the side length of the board unless length is
+        given.
+
+        :param p1_starts: A boolean representing whether Player 1 is the first
+                          to make a move.
+        :type p1_starts: bool
+        :param length: The side length of the board, or None to ask.
+        :type length: int | None
+        """
+        if length is None:
+            length = int(input("Enter the side length of the board: "))
+        self.current_state = StonehengeState(p1_starts, length)
+
+    def get_instructions(self):
+        """
+        Return the instructions for this Game.
+
+        :return: The instructions for this Game.
+        :rtype: str
+        """
+        instructions = "Players take turns claiming cells . When a player " \
+                       "captures at least half " \
+                       "of the cells in a ley-line, then the player captures " \
+                       "that ley-line. The first " \
+                       "player to capture at least half of the ley-lines is " \
+                       "the winner. A ley-line, " \
+                       "once claimed, cannot be taken by the other player"
+        return instructions
+
+    def is_over(self, state):
+        """
+        Return whether or not this game is over.
+
+        :return: True if the game is over, False otherwise.
+        :rtype: bool
+        """
+        least_ley = state.geometry.least_ley
+        return (state.p2_score >= least_ley) or (state.p1_score >= least_ley)
+
+    def is_winner(self, player):
+        """
+        Return whether player has won the game.
+
+        Precondition: player is 'p1' or 'p2'.
+
+        :param player: The player to check.
+        :type player: str
+        :return: Whether player has won or not.
+        :rtype: bool
+        """
+        return self.winner(self.current_state) == player
+
+    def winner(self, state):
+        """
+        Return the player who has won the game at state, or None if nobody
+        has. The winner is the player who just moved and has claimed more
+        ley-lines than their opponent.
+
+        :param state: The state to check.
+        :type state: StonehengeState
+        :return: 'p1', 'p2' or None.
+        :rtype: str | None
+        """
+        if not self.is_over(state):
+            return None
+        if state.get_current_player_name() == 'p2' and \
+                state.p2_score < state.p1_score:
+            return 'p1'
+        elif state.get_current_player_name() == 'p1' and \
+                state.p2_score > state.p1_score:
+            return 'p2'
+        return None
+
+    def str_to_move(self, string):
+        """
+        Return the move that string represents. If string is not a move,
+        return an invalid move.
+
+        :param string:
+        :type string:
+        :return: string
+        :rtype: str
+        """
+        if not string.strip().isalpha():
+            return -1
+        return string.strip().upper()
+
+
+
+
+class StonehengeState(GameState):
+    """
+    The state of a game at a certain point in time.
+
+    The cells, ley-lines and claim rules of the board are looked up in the
+    StonehengeGeometry shared by every state of the same side length.
+    make_move builds a new state, which shares every part of the board that
+    the move leaves alone, and leaves the old state as it was. push and pop
+    instead change a state in place: from its first push on, the state keeps
+    its board in a bytearray and a list that each move updates and pop
+    undoes. Its hash changes with every push and pop, so a state with moves
+    pushed onto it must not be used as a key of a table or set.
+
+    cells - cells[i] is the player (1 or 2) holding cell i of the geometry,
+            or 0 if the cell is free
+    leys - leys[i] is the player (1 or 2) who claimed ley-line i of the
+           geometry, or 0 if it is unclaimed
+    counts - counts[2 * i] and counts[2 * i + 1] are the number of cells p1
+             and p2 hold on ley-line i of the geometry
+    p1_score, p2_score - the number of ley-lines p1 and p2 have claimed
+    zobrist - the Zobrist hash of this state, kept up to date by every move
+    history - the cell and the ley-lines claimed by each move pushed onto
+              this state and not popped yet (or None for a move that
+              claimed no cell), or None if no move has ever been pushed
+    """
+    __slots__ = ('length', 'geometry', 'cells', 'leys', 'counts',
+                 'p1_score', 'p2_score', 'zobrist', 'history')
+    length: int
+    geometry: StonehengeGeometry
+    cells: Union[bytes, bytearray]
+    leys: Union[bytes, bytearray]
+    counts: Sequence[int]
+    p1_score: int
+    p2_score: int
+    zobrist: int
+    history: Optional[List[Optional[Tuple[int, Tuple[int, ...]]]]]
+
+    def __init__(self, is_p1_turn: bool, length: int) -> None:
+        """
+        Initialize this game state and set the current player based on
+        is_p1_turn.
+        """
+        super().__init__(is_p1_turn)
+        self.length = length
+        self.geometry = get_geometry(length)
+        self.cells = bytes(len(self.geometry.labels))
+        self.leys = bytes(len(self.geometry.ley_keys))
+        self.counts = (0,) * (2 * len(self.geometry.ley_keys))
+        self.p1_score = 0
+        self.p2_score = 0
+        self.zobrist = self.geometry.zobrist_p1_turn if is_p1_turn else 0
+        self.history = None
+
+    @property
+    def init_alpha(self) -> Dict[str, str]:
+        """
+        Return the cells of this state as a new dict: each cell letter maps
+        to itself, or to the number of the player holding it.
+        """
+        return {label: str(owner) if owner else label
+                for label, owner in zip(self.geometry.labels, self.cells)}
+
+    @property
+    def ley_counts(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Return, for each ley-line of the geometry, the number of cells p1 and
+        p2 hold on it.
+        """
+        counts = self.counts
+        return tuple((counts[i], counts[i + 1])
+                     for i in range(0, len(counts), 2))
+
+    @property
+    def init_ley(self) -> Dict[str, str]:
+        """
+        Return the ley-lines of this state as a new dict: each ley-line maps
+        to '@', or to the number of the player who claimed it.
+        """
+        return {key: str(owner) if owner else '@'
+                for key, owner in zip(self.geometry.ley_keys, self.leys)}
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether other is a StonehengeState of the same position: the
+        same board, the same claimed ley-lines and the same player to move.
+        """
+        return (type(other) == type(self) and
+                self.zobrist == other.zobrist and
+                self.p1_turn == other.p1_turn and
+                self.length == other.length and
+                self.cells == other.cells and
+                self.leys == other.leys)
+
+    def __hash__(self) -> int:
+        """
+        Return the Zobrist hash of this state.
+        """
+        return self.zobrist
+
+    def to_code(self) -> int:
+        """
+        Return a single int encoding this state: the owner of every cell and
+        ley-line in base 3, the player to move and the side length.
+
+        >>> s = StonehengeState(True, 1).make_move('A')
+        >>> StonehengeState.from_code(s.to_code()) == s
+        True
+        """
+        return self.geometry.encode(self.p1_turn, self.cells, self.leys)
+
+    @classmethod
+    def from_code(cls, code: int) -> 'StonehengeState':
+        """
+        Return the state encoded by code, as returned by to_code().
+        """
+        geometry = get_geometry(code_length(code))
+        p1_turn, cells, leys = geometry.decode(code)
+        state = cls(p1_turn, geometry.length)
+        counts = [0] * (2 * len(geometry.ley_keys))
+        for cell, owner in enumerate(cells):
+            if owner:
+                for ley in geometry.cell_leys[cell]:
+                    counts[2 * ley + owner - 1] += 1
+        state.cells = bytes(cells)
+        state.leys = bytes(leys)
+        state.counts = tuple(counts)
+        state.p1_score = leys.count(1)
+        state.p2_score = leys.count(2)
+        state.zobrist = geometry.zobrist(p1_turn, cells, leys)
+        return state
+
+    def canonical(self) -> 'StonehengeState':
+        """
+        Return the representative of this state's symmetry class: of all the
+        states that a rotation or reflection of the board turns this state
+        into, the one with the smallest code. Symmetric states have the same
+        game value and the same canonical state.
+
+        >>> s = StonehengeState(True, 2)
+        >>> s.make_move('A').canonical() == s.make_move('G').canonical()
+        True
+        """
+        return StonehengeState.from_code(
+            self.geometry.canonical_code(self.to_code()))
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the current state of the game.
+
+        >>> s = StonehengeState(True, 2)
+        >>> print(s.make_move('A'))
+                1   @
+               /   /
+          1 - 1 - B   @
+             / \\ / \\ /
+        @ - C - D - E
+             \\ / \\ / \\
+          @ - F - G   @
+               \\   \\
+                @   @
+        """
+        geometry = self.geometry
+        return geometry.render(
+            [str(owner) if owner else label
+             for label, owner in zip(geometry.labels, self.cells)],
+            [str(owner) if owner else '@' for owner in self.leys])
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be applied to this state.
+
+        >>> s = StonehengeState(True, 1)
+        >>> s.get_possible_moves()
+        ['A', 'B', 'C']
+        >>> s = StonehengeState(True, 2).make_move('B').make_move('G')
+        >>> s.get_possible_moves()
+        ['A', 'C', 'D', 'E', 'F']
+        >>> StonehengeState(True, 1).make_move('A').get_possible_moves()
+        []
+        """
+        least_ley = self.geometry.least_ley
+        if (self.p2_score >= least_ley) or (self.p1_score >= least_ley):
+            return []
+
+        return [label for label, owner in zip(self.geometry.labels, self.cells)
+                if not owner]
+
+
+    def make_move(self, move: Any) -> "StonehengeState":
+        """
+        Return the GameState that results from applying move to this GameState.
+
+        Only the three ley-lines through the claimed cell can change, so only
+        their counts are updated and checked against their claim thresholds.
+        Everything else is shared with this state rather than copied, unless
+        moves have been pushed onto this state, whose board changes in place.
+        """
+        new_state = StonehengeState.__new__(StonehengeState)
+        new_state.p1_turn = self.p1_turn
+        new_state.length = self.length
+        new_state.geometry = self.geometry
+        if self.history is None:
+            new_state.cells = self.cells
+            new_state.leys = self.leys
+            new_state.counts = self.counts
+        else:
+            new_state.cells = bytes(self.cells)
+            new_state.leys = bytes(self.leys)
+            new_state.counts = tuple(self.counts)
+        new_state.p1_score = self.p1_score
+        new_state.p2_score = self.p2_score
+        new_state.zobrist = self.zobrist
+        new_state.history = None
+        new_state._apply(move)
+        return new_state
+
+    def push(self, move: Any) -> None:
+        """
+        Apply move to this state in place, so that pop() can undo it.
+
+        The cell, the counts of the three ley-lines through it and any
+        ley-line it claims are changed where they are, with nothing copied;
+        only the cell and the ley-lines claimed are kept for pop().
+
+        >>> s = StonehengeState(True, 1)
+        >>> s.push('a')
+        >>> s.get_possible_moves()
+        []
+        >>> s.pop()
+        >>> s == StonehengeState(True, 1)
+        True
+        """
+        if self.history is None:
+            self.history = []
+            self.cells = bytearray(self.cells)
+            self.leys = bytearray(self.leys)
+            self.counts = list(self.counts)
+        if type(move) == str:
+            move = move.upper()
+
+        geometry = self.geometry
+        p1_turn = self.p1_turn
+        self.p1_turn = not p1_turn
+        self.zobrist ^= geometry.zobrist_p1_turn
+
+        cells = self.cells
+        cell = geometry.cell_index.get(move)
+        if cell is None or cells[cell]:
+            self.history.append(None)
+            return
+        player = 0 if p1_turn else 1
+        cells[cell] = player + 1
+        self.zobrist ^= geometry.zobrist_cells[cell][player]
+
+        counts = self.counts
+        leys = self.leys
+        claimed = ()
+        for ley in geometry.cell_leys[cell]:
+            index = 2 * ley + player
+            counts[index] += 1
+            if not leys[ley] and counts[index] >= geometry.thresholds[ley]:
+                leys[ley] = player + 1
+                self.zobrist ^= geometry.zobrist_leys[ley][player]
+                claimed += (ley,)
+        if claimed:
+            if p1_turn:
+                self.p1_score += len(claimed)
+            else:
+                self.p2_score += len(claimed)
+        self.history.append((cell, claimed))
+
+    def pop(self) -> None:
+        """
+        Undo the last move applied to this state by push(): free its cell,
+        take it off the counts of the three ley-lines through it and unclaim
+        the ley-lines it claimed.
+
+        Precondition: a move has been pushed and not popped yet.
+        """
+        last = self.history.pop()
+        geometry = self.geometry
+        self.p1_turn = not self.p1_turn
+        self.zobrist ^= geometry.zobrist_p1_turn
+        if last is None:
+            return
+
+        cell, claimed = last
+        player = 0 if self.p1_turn else 1
+        self.cells[cell] = 0
+        self.zobrist ^= geometry.zobrist_cells[cell][player]
+        counts = self.counts
+        for ley in geometry.cell_leys[cell]:
+            counts[2 * ley + player] -= 1
+        if claimed:
+            for ley in claimed:
+                self.leys[ley] = 0
+                self.zobrist ^= geometry.zobrist_leys[ley][player]
+            if player == 0:
+                self.p1_score -= len(claimed)
+            else:
+                self.p2_score -= len(claimed)
+
+    def _apply(self, move: Any) -> None:
+        """
+        Apply move to this state, for the player whose turn it is, by
+        replacing the cells, ley-lines and counts it changes rather than
+        modifying them, so any state sharing them is left alone.
+        """
+        if type(move) == str:
+            move = move.upper()
+
+        geometry = self.geometry
+        p1_turn = self.p1_turn
+        self.p1_turn = not p1_turn
+        self.zobrist ^= geometry.zobrist_p1_turn
+
+        cell = geometry.cell_index.get(move)
+        if cell is None or self.cells[cell]:
+            return
+        player = 0 if p1_turn else 1
+        cells = bytearray(self.cells)
+        cells[cell] = player + 1
+        self.cells = bytes(cells)
+        self.zobrist ^= geometry.zobrist_cells[cell][player]
+
+        counts = list(self.counts)
+        leys = None
+        for ley in geometry.cell_leys[cell]:
+            index = 2 * ley + player
+            counts[index] += 1
+            if not self.leys[ley] and \
+                    counts[index] >= geometry.thresholds[ley]:
+                if leys is None:
+                    leys = bytearray(self.leys)
+                leys[ley] = player + 1
+                self.zobrist ^= geometry.zobrist_leys[ley][player]
+                if p1_turn:
+                    self.p1_score += 1
+                else:
+                    self.p2_score += 1
+        self.counts = tuple(counts)
+        if leys is not None:
+            self.leys = bytes(leys)
+
+    def __reduce__(self) -> tuple:
+        """
+        Return how to pickle this state: as its code, so a state sent to
+        another process is rebuilt around that process's shared geometry.
+        """
+        return StonehengeState.from_code, (self.to_code(),)
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this state (which can be used for
+        equality testing).
+
+        >>> StonehengeState(False, 2)
+        StonehengeState.from_code(2)
+        """
+        return 'StonehengeState.from_code({})'.format(self.to_code())
+
+    def rough_outcome(self) -> float:
+        """
+        Return an estimate in interval [LOSE, WIN] of best outcome the current
+        player can guarantee from state self.
+
+        A finished game gives its exact score. Otherwise, WIN is returned if
+        some move wins straight away, and LOSE if every move lets the
+        opponent win straight away. Both are worked out from the ley-line
+        counts without making any moves. Failing that, the estimate is
+        strictly between LOSE and WIN and grows with the current player's
+        lead in claimed ley-lines and in threats: unclaimed ley-lines that a
+        player can claim with one more cell.
+
+        >>> s = StonehengeState(True, 1)
+        >>> s.rough_outcome()
+        1
+        >>> s.make_move('A').rough_outcome()
+        -1
+        >>> s = StonehengeState(True, 2).make_move('D').make_move('A')
+        >>> -1 < s.rough_outcome() < 1
+        True
+        """
+        geometry = self.geometry
+        least_ley = geometry.least_ley
+        player = 0 if self.p1_turn else 1
+        scores = (self.p1_score, self.p2_score)
+        if scores[player] >= least_ley:
+            return self.WIN
+        if scores[1 - player] >= least_ley:
+            return self.LOSE
+
+        # threats[p][i] is whether player p claims ley-line i with one more
+        # cell on it
+        threats = [[not self.leys[ley] and
+                    self.counts[2 * ley + p] + 1 >= geometry.thresholds[ley]
+                    for ley in range(len(self.leys))] for p in [0, 1]]
+        free = [cell for cell, owner in enumerate(self.cells) if not owner]
+        gains = [[[ley for ley in geometry.cell_leys[cell] if threats[p][ley]]
+                  for cell in free] for p in [0, 1]]
+
+        mine, theirs = gains[player], gains[1 - player]
+        if scores[player] + max(len(leys) for leys in mine) >= least_ley:
+            return self.WIN
+        need = least_ley - scores[1 - player]
+        if len(free) > 1 and all(
+                any(len([ley for ley in theirs[j] if ley not in mine[i]]) >=
+                    need for j in range(len(free)) if j != i)
+                for i in range(len(free))):
+            return self.LOSE
+
+        lead = (scores[player] - scores[1 - player] +
+                (threats[player].count(True) -
+                 threats[1 - player].count(True)) / 2)
+        return lead / (abs(lead) + least_ley)
+
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,328 @@
+"""
+An implementation of a state for Stonehenge backed by integer bitmasks.
+
+Cell i of the board is bit i of a mask, in the same order as the cell
+letters. Each player has a mask of the cells they hold and a mask of the
+ley-lines they have claimed, so applying a move only copies a few ints.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from game_state import GameState
+from stonehenge import StonehengeState
+from stonehenge_geometry import code_length, get_geometry
+
+
+class BitboardStonehengeState(GameState):
+    """
+    The state of a game of Stonehenge at a certain point in time, stored as
+    bitmasks. It renders and behaves like the StonehengeState it stands for,
+    so it can be searched by any of the strategies.
+
+    length - the side length of the board
+    geometry - the shared tables describing the board
+    p1_cells, p2_cells - the mask of the cells each player holds
+    p1_leys, p2_leys - the mask of the ley-lines each player has claimed
+    zobrist - the Zobrist hash of this state, kept up to date by every move
+    history - the masks and hash this state had before each move pushed
+              onto it and not popped yet, or None if no move has been pushed
+    """
+    __slots__ = ('length', 'geometry', 'p1_cells', 'p2_cells', 'p1_leys',
+                 'p2_leys', 'zobrist', 'history')
+    length: int
+    p1_cells: int
+    p2_cells: int
+    p1_leys: int
+    p2_leys: int
+    zobrist: int
+    history: Optional[List[Tuple[int, int, int, int, int]]]
+
+    def __init__(self, is_p1_turn: bool, length: int) -> None:
+        """
+        Initialize this game state with an empty board of side length length
+        and set the current player based on is_p1_turn.
+        """
+        super().__init__(is_p1_turn)
+        self.length = length
+        self.geometry = get_geometry(length)
+        self.p1_cells = 0
+        self.p2_cells = 0
+        self.p1_leys = 0
+        self.p2_leys = 0
+        self.zobrist = self.geometry.zobrist_p1_turn if is_p1_turn else 0
+        self.history = None
+
+    @classmethod
+    def from_state(cls, state: StonehengeState) -> 'BitboardStonehengeState':
+        """
+        Return the bitboard state standing for the StonehengeState state.
+        """
+        new_state = cls(state.p1_turn, state.length)
+        for i, owner in enumerate(state.cells):
+            if owner == 1:
+                new_state.p1_cells |= 1 << i
+            elif owner == 2:
+                new_state.p2_cells |= 1 << i
+        for i, owner in enumerate(state.leys):
+            if owner == 1:
+                new_state.p1_leys |= 1 << i
+            elif owner == 2:
+                new_state.p2_leys |= 1 << i
+        new_state.zobrist = state.zobrist
+        return new_state
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether other is a BitboardStonehengeState of the same
+        position.
+        """
+        return (type(other) == type(self) and
+                self.zobrist == other.zobrist and
+                self.p1_turn == other.p1_turn and
+                self.length == other.length and
+                self.p1_cells == other.p1_cells and
+                self.p2_cells == other.p2_cells and
+                self.p1_leys == other.p1_leys and
+                self.p2_leys == other.p2_leys)
+
+    def __hash__(self) -> int:
+        """
+        Return the Zobrist hash of this state, which is the same as the hash
+        of the StonehengeState it stands for.
+        """
+        return self.zobrist
+
+    def to_code(self) -> int:
+        """
+        Return a single int encoding this state, the same as the code of the
+        StonehengeState it stands for.
+        """
+        geometry = self.geometry
+        cells = [(self.p1_cells >> i & 1) + 2 * (self.p2_cells >> i & 1)
+                 for i in range(len(geometry.labels))]
+        leys = [(self.p1_leys >> i & 1) + 2 * (self.p2_leys >> i & 1)
+                for i in range(len(geometry.ley_keys))]
+        return geometry.encode(self.p1_turn, cells, leys)
+
+    @classmethod
+    def from_code(cls, code: int) -> 'BitboardStonehengeState':
+        """
+        Return the state encoded by code, as returned by to_code().
+        """
+        geometry = get_geometry(code_length(code))
+        p1_turn, cells, leys = geometry.decode(code)
+        state = cls(p1_turn, geometry.length)
+        for cell, owner in enumerate(cells):
+            if owner == 1:
+                state.p1_cells |= 1 << cell
+            elif owner == 2:
+                state.p2_cells |= 1 << cell
+        for ley, owner in enumerate(leys):
+            if owner == 1:
+                state.p1_leys |= 1 << ley
+            elif owner == 2:
+                state.p2_leys |= 1 << ley
+        state.zobrist = geometry.zobrist(p1_turn, cells, leys)
+        return state
+
+    def canonical(self) -> 'BitboardStonehengeState':
+        """
+        Return the representative of this state's symmetry class, standing
+        for the canonical form of the StonehengeState this state stands for.
+        """
+        return BitboardStonehengeState.from_code(
+            self.geometry.canonical_code(self.to_code()))
+
+    def _cell_marks(self) -> List[str]:
+        """
+        Return the mark of each cell of the geometry, in order: the cell's
+        letter, or the number of the player holding it.
+        """
+        p1_cells = self.p1_cells
+        p2_cells = self.p2_cells
+        return ['1' if p1_cells >> i & 1 else '2' if p2_cells >> i & 1 else
+                label for i, label in enumerate(self.geometry.labels)]
+
+    def _ley_marks(self) -> List[str]:
+        """
+        Return the mark of each ley-line of the geometry, in order: '@', or
+        the number of the player who claimed it.
+        """
+        p1_leys = self.p1_leys
+        p2_leys = self.p2_leys
+        return ['1' if p1_leys >> i & 1 else '2' if p2_leys >> i & 1 else
+                '@' for i in range(len(self.geometry.ley_keys))]
+
+    @property
+    def init_alpha(self) -> Dict[str, str]:
+        """
+        Return the cells of this state in the form of StonehengeState's
+        init_alpha: each cell letter maps to itself, or to the number of the
+        player holding it.
+        """
+        return dict(zip(self.geometry.labels, self._cell_marks()))
+
+    @property
+    def init_ley(self) -> Dict[str, str]:
+        """
+        Return the ley-lines of this state in the form of StonehengeState's
+        init_ley: each ley-line maps to '@', or to the number of the player
+        who claimed it.
+        """
+        return dict(zip(self.geometry.ley_keys, self._ley_marks()))
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the current state of the game,
+        drawn the same way as StonehengeState.
+        """
+        return self.geometry.render(self._cell_marks(), self._ley_marks())
+
+    @property
+    def p1_score(self) -> int:
+        """
+        Return the number of ley-lines p1 has claimed.
+        """
+        return bin(self.p1_leys).count('1')
+
+    @property
+    def p2_score(self) -> int:
+        """
+        Return the number of ley-lines p2 has claimed.
+        """
+        return bin(self.p2_leys).count('1')
+
+    def get_possible_moves(self) -> list:
+        """
+        Return all possible moves that can be applied to this state.
+
+        >>> s = BitboardStonehengeState(True, 1)
+        >>> s.get_possible_moves()
+        ['A', 'B', 'C']
+        >>> s.make_move('A').get_possible_moves()
+        []
+        """
+        least_ley = self.geometry.least_ley
+        if self.p1_score >= least_ley or self.p2_score >= least_ley:
+            return []
+        taken = self.p1_cells | self.p2_cells
+        return [label for i, label in enumerate(self.geometry.labels)
+                if not taken >> i & 1]
+
+    def make_move(self, move: Any) -> 'BitboardStonehengeState':
+        """
+        Return the GameState that results from applying move to this GameState.
+
+        Only the ley-lines going through the claimed cell are checked, and a
+        check is a single popcount of the player's cells on that line.
+
+        >>> s = BitboardStonehengeState(True, 1)
+        >>> s.make_move('b') == s.make_move('B')
+        True
+        """
+        new_state = BitboardStonehengeState.__new__(BitboardStonehengeState)
+        new_state.p1_turn = self.p1_turn
+        new_state.length = self.length
+        new_state.geometry = self.geometry
+        new_state.p1_cells = self.p1_cells
+        new_state.p2_cells = self.p2_cells
+        new_state.p1_leys = self.p1_leys
+        new_state.p2_leys = self.p2_leys
+        new_state.zobrist = self.zobrist
+        new_state.history = None
+        new_state._apply(move)
+        return new_state
+
+    def push(self, move: Any) -> None:
+        """
+        Apply move to this state in place, so that pop() can undo it.
+
+        >>> s = BitboardStonehengeState(True, 1)
+        >>> s.push('A')
+        >>> s.get_possible_moves()
+        []
+        >>> s.pop()
+        >>> s == BitboardStonehengeState(True, 1)
+        True
+        """
+        if self.history is None:
+            self.history = []
+        self.history.append((self.p1_cells, self.p2_cells, self.p1_leys,
+                             self.p2_leys, self.zobrist))
+        self._apply(move)
+
+    def pop(self) -> None:
+        """
+        Undo the last move applied to this state by push().
+
+        Precondition: a move has been pushed and not popped yet.
+        """
+        (self.p1_cells, self.p2_cells, self.p1_leys, self.p2_leys,
+         self.zobrist) = self.history.pop()
+        self.p1_turn = not self.p1_turn
+
+    def _apply(self, move: Any) -> None:
+        """
+        Apply move to this state in place, for the player whose turn it is.
+        """
+        if type(move) == str:
+            move = move.upper()
+
+        geometry = self.geometry
+        p1_turn = self.p1_turn
+        self.p1_turn = not p1_turn
+        self.zobrist ^= geometry.zobrist_p1_turn
+
+        cell = geometry.cell_index.get(move)
+        if cell is None or (self.p1_cells | self.p2_cells) >> cell & 1:
+            return
+
+        claimed = self.p1_leys | self.p2_leys
+        if p1_turn:
+            cells = self.p1_cells = self.p1_cells | 1 << cell
+        else:
+            cells = self.p2_cells = self.p2_cells | 1 << cell
+        player = 0 if p1_turn else 1
+        self.zobrist ^= geometry.zobrist_cells[cell][player]
+        new_leys = 0
+        for ley in geometry.cell_leys[cell]:
+            if not claimed >> ley & 1 and \
+                    bin(cells & geometry.ley_masks[ley]).count('1') >= \
+                    geometry.thresholds[ley]:
+                new_leys |= 1 << ley
+                self.zobrist ^= geometry.zobrist_leys[ley][player]
+        if p1_turn:
+            self.p1_leys |= new_leys
+        else:
+            self.p2_leys |= new_leys
+
+    def rough_outcome(self) -> float:
+        """
+        Return an estimate in interval [LOSE, WIN] of best outcome the current
+        player can guarantee from state self: the estimate of the
+        StonehengeState this state stands for.
+
+        >>> s = BitboardStonehengeState(True, 1)
+        >>> s.rough_outcome()
+        1
+        >>> s.make_move('A').rough_outcome()
+        -1
+        """
+        return StonehengeState.from_code(self.to_code()).rough_outcome()
+
+    def __reduce__(self) -> tuple:
+        """
+        Return how to pickle this state: as its code, so a state sent to
+        another process is rebuilt around that process's shared geometry.
+        """
+        return BitboardStonehengeState.from_code, (self.to_code(),)
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this state (which can be used for
+        equality testing).
+        """
+        return 'BitboardStonehengeState.from_code({})'.format(self.to_code())
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
@@ -0,0 +1,349 @@
+"""
+The geometry of a Stonehenge board of any side length.
+
+A board of side length n has n + 1 rows of cells. Row r has r + 2 cells for
+r < n, and the last row has n cells. Every cell lies on three ley-lines: its
+row ('-'), its '/' diagonal and its '\\' diagonal, for 3n + 3 ley-lines in
+all. A player claims a ley-line by holding at least half of its cells, and
+wins by claiming at least half of the ley-lines.
+
+NOTE: You do not have to run python-ta on this file.
+"""
+import random
+from itertools import permutations
+from typing import Dict, List, Tuple
+
+# The side length is stored in the lowest digit of a position's code, in
+# base LENGTH_RADIX, so the code alone says which geometry to decode it with.
+LENGTH_RADIX = 64
+
+
+def cell_label(index: int) -> str:
+    """
+    Return the letter(s) naming the cell at index: A to Z, then AA, AB, ...
+
+    >>> cell_label(0)
+    'A'
+    >>> cell_label(25)
+    'Z'
+    >>> cell_label(26)
+    'AA'
+    """
+    label = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord('A') + remainder) + label
+    return label
+
+
+class StonehengeGeometry:
+    """
+    The precomputed tables describing a Stonehenge board of one side length.
+    They never change, so every state of that length shares them.
+
+    Cells are numbered row by row, left to right. Ley-lines are numbered
+    with the '/' lines first, then the '\\' lines, then the '-' lines.
+
+    length - the side length of the board
+    rows - the cell indices in each row
+    labels - the letter(s) naming each cell
+    cell_index - the index of the cell named by each label
+    ley_keys - the name of each ley-line, such as '/1', '\\2' or '-3'
+    ley_cells - the cell indices on each ley-line
+    ley_masks - a bitmask with the bits of the cells on each ley-line set
+    thresholds - the number of cells needed to claim each ley-line
+    cell_leys - the indices of the three ley-lines through each cell
+    least_ley - the number of ley-lines needed to win
+    zobrist_cells - the random 64-bit keys of p1 and p2 holding each cell
+    zobrist_leys - the random 64-bit keys of p1 and p2 claiming each ley-line
+    zobrist_p1_turn - the random 64-bit key of it being p1's turn
+    symmetries - the (cell map, ley-line map) pairs of every rotation and
+                 reflection mapping the board onto itself; a symmetry sends
+                 cell i to cell map[i] and ley-line i to ley-line map[i]
+    """
+    length: int
+    rows: List[List[int]]
+    labels: List[str]
+    cell_index: Dict[str, int]
+    ley_keys: List[str]
+    ley_cells: List[Tuple[int, ...]]
+    ley_masks: List[int]
+    thresholds: List[int]
+    cell_leys: List[Tuple[int, int, int]]
+    least_ley: int
+    zobrist_cells: List[Tuple[int, int]]
+    zobrist_leys: List[Tuple[int, int]]
+    zobrist_p1_turn: int
+    symmetries: List[Tuple[List[int], List[int]]]
+
+    def __init__(self, length: int) -> None:
+        """
+        Compute the tables for a board of side length length.
+        """
+        self.length = length
+        self.rows = []
+        positions = []
+        for row in range(length + 1):
+            size = row + 2 if row < length else length
+            self.rows.append(list(range(len(positions),
+                                        len(positions) + size)))
+            positions.extend((row, column) for column in range(size))
+
+        self.labels = [cell_label(i) for i in range(len(positions))]
+        self.cell_index = {label: i for i, label in enumerate(self.labels)}
+
+        lines_per_direction = length + 1
+        self.ley_keys = [direction + str(i + 1) for direction in '/\\-'
+                         for i in range(lines_per_direction)]
+        members = [[] for _ in self.ley_keys]
+        self.cell_leys = []
+        for cell, (row, column) in enumerate(positions):
+            # The last row is shifted one cell to the right of the rows above
+            shift = 1 if row == length else 0
+            leys = (column + shift,
+                    lines_per_direction + length - row + column + shift - 1,
+                    2 * lines_per_direction + row)
+            for ley in leys:
+                members[ley].append(cell)
+            self.cell_leys.append(leys)
+
+        self.ley_cells = [tuple(cells) for cells in members]
+        self.symmetries = self._find_symmetries(positions)
+        self.ley_masks = [sum(1 << cell for cell in cells)
+                          for cells in self.ley_cells]
+        self.thresholds = [(len(cells) + 1) // 2 for cells in self.ley_cells]
+        self.least_ley = (len(self.ley_keys) + 1) // 2
+
+        # The keys are drawn from a generator seeded with the side length, so
+        # a position hashes to the same value in every process.
+        rng = random.Random(length)
+        self.zobrist_cells = [(rng.getrandbits(64), rng.getrandbits(64))
+                              for _ in self.labels]
+        self.zobrist_leys = [(rng.getrandbits(64), rng.getrandbits(64))
+                             for _ in self.ley_keys]
+        self.zobrist_p1_turn = rng.getrandbits(64)
+
+    def _find_symmetries(self, positions: List[Tuple[int, int]]
+                         ) -> List[Tuple[List[int], List[int]]]:
+        """
+        Return the symmetries of the board whose cells are at positions, a
+        list of (row, column) pairs.
+
+        The cells sit on a hexagonal grid. In cube coordinates (x, y, z)
+        with x + y + z == 0, the '/' lines are the lines of constant x, the
+        '\\' lines those of constant y and the rows those of constant z. The
+        grid's 12 rotations and reflections permute the three coordinates
+        and possibly negate all of them; each one that maps the cells onto
+        themselves after a translation is a symmetry of the board.
+        """
+        length = self.length
+        lines_per_direction = length + 1
+        cube = []
+        for row, column in positions:
+            x = column + (1 if row == length else 0)
+            cube.append((x, row - x, -row))
+        index = {point: cell for cell, point in enumerate(cube)}
+        # Each ley-line is the line where one coordinate has a fixed value
+        ley_index = {}
+        for ley, cells in enumerate(self.ley_cells):
+            axis = ley // lines_per_direction
+            ley_index[(axis, cube[cells[0]][axis])] = ley
+
+        symmetries = []
+        for order in permutations(range(3)):
+            for sign in [1, -1]:
+                image = [tuple(sign * point[order[j]] for j in range(3))
+                         for point in cube]
+                shift = [min(point[j] for point in cube) -
+                         min(point[j] for point in image) for j in range(3)]
+                image = [tuple(point[j] + shift[j] for j in range(3))
+                         for point in image]
+                if sum(shift) != 0 or any(point not in index
+                                          for point in image):
+                    continue
+                cell_map = [index[point] for point in image]
+                ley_map = [0] * len(self.ley_cells)
+                for (axis, value), ley in ley_index.items():
+                    new_axis = order.index(axis)
+                    ley_map[ley] = ley_index[(new_axis,
+                                              sign * value + shift[new_axis])]
+                symmetries.append((cell_map, ley_map))
+        return symmetries
+
+    def canonical_code(self, code: int) -> int:
+        """
+        Return the smallest code of any position symmetric to the position
+        with code code. Symmetric positions share the same canonical code.
+
+        >>> geometry = get_geometry(2)
+        >>> a = geometry.encode(False, [1, 0, 0, 0, 0, 0, 0], [0] * 9)
+        >>> g = geometry.encode(False, [0, 0, 0, 0, 0, 0, 1], [0] * 9)
+        >>> geometry.canonical_code(a) == geometry.canonical_code(g)
+        True
+        """
+        p1_turn, cells, leys = self.decode(code)
+        codes = []
+        for cell_map, ley_map in self.symmetries:
+            new_cells = [0] * len(cells)
+            for cell, owner in enumerate(cells):
+                new_cells[cell_map[cell]] = owner
+            new_leys = [0] * len(leys)
+            for ley, owner in enumerate(leys):
+                new_leys[ley_map[ley]] = owner
+            codes.append(self.encode(p1_turn, new_cells, new_leys))
+        return min(codes)
+
+    def encode(self, p1_turn: bool, cells: List[int],
+               leys: List[int]) -> int:
+        """
+        Return the code of the position where cells[i] and leys[i] are the
+        player (1 or 2) holding cell i and ley-line i, or 0 if nobody does.
+
+        Reading from the lowest digit up, the code holds the side length in
+        base LENGTH_RADIX, whether it is p1's turn in base 2, then the owner
+        of each ley-line and then the owner of each cell in base 3.
+
+        >>> geometry = get_geometry(1)
+        >>> geometry.encode(True, [0, 0, 0], [0, 0, 0, 0, 0, 0])
+        65
+        >>> geometry.decode(65)
+        (True, [0, 0, 0], [0, 0, 0, 0, 0, 0])
+        """
+        code = 0
+        for owner in reversed(cells):
+            code = code * 3 + owner
+        for owner in reversed(leys):
+            code = code * 3 + owner
+        return (code * 2 + int(p1_turn)) * LENGTH_RADIX + self.length
+
+    def decode(self, code: int) -> Tuple[bool, List[int], List[int]]:
+        """
+        Return whether it is p1's turn, and the owner of each cell and each
+        ley-line, of the position with code code.
+
+        Precondition: code_length(code) == self.length
+        """
+        code //= LENGTH_RADIX
+        code, p1_turn = divmod(code, 2)
+        leys = []
+        for _ in self.ley_keys:
+            code, owner = divmod(code, 3)
+            leys.append(owner)
+        cells = []
+        for _ in self.labels:
+            code, owner = divmod(code, 3)
+            cells.append(owner)
+        return bool(p1_turn), cells, leys
+
+    def zobrist(self, p1_turn: bool, cells: List[int],
+                leys: List[int]) -> int:
+        """
+        Return the Zobrist hash of the position where cells[i] and leys[i]
+        are the player (1 or 2) holding cell i and ley-line i, or 0 if nobody
+        does.
+        """
+        key = self.zobrist_p1_turn if p1_turn else 0
+        for cell, owner in enumerate(cells):
+            if owner:
+                key ^= self.zobrist_cells[cell][owner - 1]
+        for ley, owner in enumerate(leys):
+            if owner:
+                key ^= self.zobrist_leys[ley][owner - 1]
+        return key
+
+    def render(self, cells: List[str], leys: List[str]) -> str:
+        """
+        Return the board drawn with the marker cells[i] in cell i and the
+        marker leys[i] at the end of ley-line i.
+
+        Every marker is centred in a field as wide as the widest cell label
+        or marker, rounded up to an odd width, and the gaps and slashes
+        between the fields grow with it, so the board keeps its shape when
+        cells have two-letter labels.
+
+        >>> geometry = get_geometry(1)
+        >>> geometry.render(geometry.labels, ['@'] * 6).splitlines()[2]
+        '@ - A - B'
+        >>> geometry = get_geometry(6)
+        >>> geometry.render(geometry.labels, ['@'] * 21).splitlines()[-3]
+        '     @   -   AB  -   AC  -   AD  -   AE  -   AF  -   AG      @'
+        """
+        length = self.length
+        lines_per_direction = length + 1
+        field = max(len(marker) for marker in
+                    list(self.labels) + list(cells) + list(leys)) | 1
+        # The distance between the centres of two cells next to each other
+        pitch = -(-(field + 3) // 4) * 4
+        half = pitch // 2
+        quarter = pitch // 4
+        centre = (field - 1) // 2
+        gap = ' ' * (pitch - field)
+        dash = ' ' * ((pitch - field) // 2)
+        separator = dash + '-' + dash
+        cells = [marker.center(field) for marker in cells]
+        leys = [marker.center(field) for marker in leys]
+
+        def row_text(row: int) -> str:
+            """
+            Return the row's ley-line marker followed by its cells.
+            """
+            return separator.join([leys[2 * lines_per_direction + row]] +
+                                  [cells[cell] for cell in self.rows[row]])
+
+        def slashes(start: int, first: str, second: str, count: int,
+                    step: int) -> str:
+            """
+            Return count slashes, alternating first and second, step columns
+            apart, with the first at column start.
+            """
+            marks = [first if i % 2 == 0 else second for i in range(count)]
+            return ' ' * start + (' ' * (step - 1)).join(marks)
+
+        # The column of the centre of the first cell of the top row
+        top = half * (length - 1) + pitch + centre
+        lines = [' ' * (top + half - centre) + leys[0] + gap + leys[1],
+                 slashes(top + quarter, '/', '/', 2, pitch)]
+        for row in range(length):
+            if row > 0:
+                lines.append(slashes(half * (length - 1 - row) + pitch +
+                                     centre + quarter, '/', '\\',
+                                     2 * row + 3, half))
+            text = ' ' * (half * (length - 1 - row)) + row_text(row)
+            if row < length - 1:
+                text += gap + leys[row + 2]
+            lines.append(text)
+        lines.append(slashes(pitch + centre + quarter, '\\', '/',
+                             2 * length + 1, half))
+        lines.append(' ' * half + row_text(length) + gap +
+                     leys[2 * lines_per_direction - 1])
+        lines.append(slashes(half + pitch + centre + quarter, '\\', '\\',
+                             length, pitch))
+        lines.append(' ' * (2 * half + pitch) + gap.join(
+            leys[lines_per_direction:2 * lines_per_direction - 1]))
+        return '\n'.join(line.rstrip() for line in lines)
+
+
+_GEOMETRIES = {}
+
+
+def code_length(code: int) -> int:
+    """
+    Return the side length of the board of the position with code code.
+    """
+    return code % LENGTH_RADIX
+
+
+def get_geometry(length: int) -> StonehengeGeometry:
+    """
+    Return the shared geometry of a board of side length length, computing
+    it the first time it is asked for.
+    """
+    if length not in _GEOMETRIES:
+        _GEOMETRIES[length] = StonehengeGeometry(length)
+    return _GEOMETRIES[length]
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
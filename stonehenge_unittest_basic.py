@@ -11,11 +11,15 @@ the unittests can properly read. i.e. The ley-lines and cells are in the right
 spots and order; yours **do not** have to be formatted in exactly the same
 way.
 """
+import pickle
+import random
 import unittest
 from unittest.mock import patch
 
 # Import the student solution
 from game_interface import playable_games
+from stonehenge_bitboard import BitboardStonehengeState
+from stonehenge_geometry import get_geometry
 StonehengeGame = playable_games['h']
 
 # Below are some sample Stonehenge boards for use in the unittests
@@ -218,6 +222,16 @@ class StonehengeUnitTests(unittest.TestCase):
                          "When initializing a game of Stonehenge, only one " +
                          "input (e.g. 3) should be taken in.")
 
+    @patch('builtins.input', side_effect=AssertionError("input() was called"))
+    def test_stonehenge_length_argument(self, input):
+        """
+        Test that Stonehenge can be initialized with the side length as an
+        argument, without asking for input.
+        """
+        game = StonehengeGame(False, length=2)
+        self.assertEqual(str(game.current_state), BOARD_LENGTH_2)
+        self.assertEqual(game.current_state.get_current_player_name(), 'p2')
+
     @patch('builtins.input', side_effect=['3'])
     def test_get_current_player_name_true(self, input):
         """
@@ -533,6 +547,22 @@ class StonehengeUnitTests(unittest.TestCase):
                          "After calling make_move, the current_state of a " +
                          "game should not be changed.")
 
+    def test_make_move_shares_unchanged_data(self):
+        """
+        Test that a state has no per-instance __dict__, and that a move which
+        claims no ley-line shares the parent's ley-line owners.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(True)
+        state = game.current_state.make_move('A')
+        child = state.make_move('G')
+
+        self.assertFalse(hasattr(state, '__dict__'),
+                         "StonehengeState should define __slots__.")
+        self.assertIs(child.leys, state.leys)
+        self.assertEqual(state.cells, bytes([1] + [0] * 11))
+        self.assertEqual(child.cells, bytes([1] + [0] * 5 + [2] + [0] * 5))
+
     @patch('builtins.input', side_effect=['1'])
     def test_stonehenge_is_valid_move_false(self, input):
         """
@@ -618,6 +648,344 @@ class StonehengeUnitTests(unittest.TestCase):
                                  str(current_state), expected_state
                              ))
 
+    @patch('builtins.input', side_effect=['3'])
+    def test_ley_counts_and_scores_follow_moves(self, input):
+        """
+        Test that the per-ley-line cell counts and claimed ley-line totals
+        kept by make_move match a recount of the board.
+        """
+        game = StonehengeGame(True)
+        state = game.current_state
+        geometry = get_geometry(3)
+        for move in ['K', 'A', 'C', 'B', 'F', 'E', 'G', 'D']:
+            state = state.make_move(move)
+            for ley, cells in enumerate(geometry.ley_cells):
+                markers = [state.init_alpha[geometry.labels[cell]]
+                           for cell in cells]
+                expected = (markers.count('1'), markers.count('2'))
+                self.assertEqual(state.ley_counts[ley], expected,
+                                 ("After the moves up to {}, ley-line {} " +
+                                  "should have the counts {}, but has " +
+                                  "{}.").format(move, geometry.ley_keys[ley],
+                                                expected,
+                                                state.ley_counts[ley]))
+            leys = list(state.init_ley.values())
+            self.assertEqual((state.p1_score, state.p2_score),
+                             (leys.count('1'), leys.count('2')),
+                             ("After the moves up to {}, the claimed " +
+                              "ley-line totals are out of date.").format(move))
+
+    @patch('builtins.input', side_effect=['3'])
+    def test_transposed_states_equal(self, input):
+        """
+        Test that the same position reached through two move orders gives
+        equal states with equal hashes, and that other positions differ.
+        """
+        game = StonehengeGame(True)
+        first = game.current_state
+        second = game.current_state
+        for move in ['A', 'K', 'B', 'L']:
+            first = first.make_move(move)
+        for move in ['B', 'L', 'A', 'K']:
+            second = second.make_move(move)
+
+        self.assertEqual(first, second,
+                         "Claiming A, K, B, L and B, L, A, K should reach " +
+                         "equal states.")
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, second.make_move('C'))
+        self.assertNotEqual(first, game.current_state)
+
+        bitboard = BitboardStonehengeState.from_state(first)
+        self.assertEqual(hash(bitboard), hash(first))
+        self.assertEqual(bitboard.make_move('C'),
+                         BitboardStonehengeState.from_state(
+                             first.make_move('C')))
+
+    def test_push_pop_matches_make_move(self):
+        """
+        Test that pushing the moves of random games onto one state follows
+        make_move(), and that popping them goes back through the same states
+        without changing the states make_move() returned along the way.
+        """
+        rng = random.Random(2)
+        for length in range(1, 6):
+            with patch('builtins.input', return_value=str(length)):
+                game = StonehengeGame(True)
+            board = game.current_state
+            states = [type(board).from_code(board.to_code())]
+            codes = [states[0].to_code()]
+            while states[-1].get_possible_moves():
+                move = rng.choice(states[-1].get_possible_moves())
+                board.push(move)
+                states.append(states[-1].make_move(move))
+                codes.append(states[-1].to_code())
+                self.assertEqual(board, states[-1])
+                self.assertEqual(hash(board), hash(states[-1]))
+                self.assertEqual(board.ley_counts, states[-1].ley_counts)
+
+            for state in reversed(states[1:]):
+                self.assertEqual(board, state)
+                self.assertEqual(board.ley_counts, state.ley_counts)
+                board.pop()
+            self.assertEqual(board, states[0])
+            self.assertEqual([state.to_code() for state in states], codes)
+
+    def test_push_changes_board_in_place(self):
+        """
+        Test that push() and pop() update the board of a state where it is
+        instead of copying it, and that a state made from a pushed state is
+        left alone by later pushes and pops.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        board = game.current_state
+        board.push('A')
+        cells, leys, counts = board.cells, board.leys, board.counts
+        child = board.make_move('B')
+        board.push('B')
+        board.push('x')
+        board.pop()
+
+        self.assertIs(board.cells, cells)
+        self.assertIs(board.leys, leys)
+        self.assertIs(board.counts, counts)
+        self.assertEqual(board, child)
+        board.pop()
+        board.pop()
+        self.assertEqual(board, type(board)(True, 2))
+        self.assertEqual(child.cells, bytes([1, 2] + [0] * 5))
+        self.assertEqual(child.get_possible_moves(),
+                         ['C', 'D', 'E', 'F', 'G'])
+
+    def test_bitboard_stands_in_for_state(self):
+        """
+        Test that a bitboard state takes lowercase moves, pushes and pops
+        moves, and draws and estimates every position of random games the
+        same as the StonehengeState it stands for.
+        """
+        rng = random.Random(3)
+        for length in range(1, 5):
+            with patch('builtins.input', return_value=str(length)):
+                game = StonehengeGame(True)
+            state = game.current_state
+            board = BitboardStonehengeState.from_state(state)
+            pushed = 0
+            while state.get_possible_moves():
+                move = rng.choice(state.get_possible_moves())
+                self.assertEqual(board.make_move(move.lower()),
+                                 board.make_move(move))
+                board.push(move.lower())
+                pushed += 1
+                state = state.make_move(move)
+                self.assertEqual(board,
+                                 BitboardStonehengeState.from_state(state))
+                self.assertEqual(str(board), str(state))
+                self.assertEqual(board.rough_outcome(), state.rough_outcome())
+
+            for _ in range(pushed):
+                board.pop()
+            self.assertEqual(board, BitboardStonehengeState.from_state(
+                game.current_state))
+
+    def test_pickle_round_trip(self):
+        """
+        Test that a pickled state is rebuilt equal to the original, around
+        the shared geometry of its side length.
+        """
+        with patch('builtins.input', return_value='3'):
+            game = StonehengeGame(False)
+        state = game.current_state.make_move('A').make_move('L')
+        for original in [state, BitboardStonehengeState.from_state(state)]:
+            copy = pickle.loads(pickle.dumps(original))
+            self.assertEqual(copy, original)
+            self.assertEqual(str(copy), str(original))
+            self.assertIs(copy.geometry, get_geometry(3))
+
+    def test_code_round_trip(self):
+        """
+        Test that to_code() and from_code() round-trip random positions, and
+        that a bitboard encodes to the same code as the state it stands for.
+        """
+        rng = random.Random(1)
+        for length in range(1, 6):
+            with patch('builtins.input', return_value=str(length)):
+                game = StonehengeGame(rng.random() < 0.5)
+            state = game.current_state
+            while state.get_possible_moves():
+                state = state.make_move(rng.choice(state.get_possible_moves()))
+                code = state.to_code()
+                decoded = type(state).from_code(code)
+
+                self.assertEqual(decoded, state)
+                self.assertEqual(hash(decoded), hash(state))
+                self.assertEqual(str(decoded), str(state))
+                self.assertEqual(decoded.ley_counts, state.ley_counts)
+                self.assertEqual(repr(decoded), repr(state))
+                self.assertEqual(
+                    BitboardStonehengeState.from_state(state).to_code(), code)
+                self.assertEqual(
+                    BitboardStonehengeState.from_code(code),
+                    BitboardStonehengeState.from_state(state))
+
+
+class StonehengeGeometryUnitTests(unittest.TestCase):
+    def test_geometry_length_3(self):
+        """
+        Test the ley-lines and claim thresholds generated for a board with a
+        side-length of 3.
+        """
+        geometry = get_geometry(3)
+        ley_lines = [''.join(geometry.labels[cell] for cell in cells)
+                     for cells in geometry.ley_cells]
+        expected = ['ACF', 'BDGJ', 'EHK', 'IL',
+                    'FJ', 'CGK', 'ADHL', 'BEI',
+                    'AB', 'CDE', 'FGHI', 'JKL']
+
+        self.assertEqual(ley_lines, expected,
+                         ("The ley-lines of a board with a side-length of 3 " +
+                          "should be {}, but {} were generated.").format(
+                              expected, ley_lines))
+        self.assertEqual(geometry.thresholds,
+                         [2, 2, 2, 1, 1, 2, 2, 2, 1, 2, 2, 2])
+        self.assertEqual(geometry.least_ley, 6)
+
+    def test_large_board_to_end(self):
+        """
+        Test that a game on a board with a side-length of 8 can be played to
+        the end, and that every move claims a cell.
+        """
+        with patch('builtins.input', return_value='8'):
+            game = StonehengeGame(True)
+        state = game.current_state
+        cells = len(get_geometry(8).labels)
+        self.assertEqual(len(state.get_possible_moves()), cells)
+
+        while not game.is_over(state):
+            moves = state.get_possible_moves()
+            state = state.make_move(moves[len(moves) // 2])
+            self.assertEqual(len(state.get_possible_moves()) or
+                             len(moves) - 1, len(moves) - 1)
+        game.current_state = state
+        self.assertTrue(game.is_winner('p1') or game.is_winner('p2'),
+                        "A finished game of Stonehenge should have a winner.")
+
+    def test_large_board_render_lines_up(self):
+        """
+        Test that on boards with two-letter cell labels, the cells of every
+        ley-line are drawn along a straight line, and that claiming a cell
+        does not move anything else on the board.
+        """
+        for length in [6, 7]:
+            with patch('builtins.input', return_value=str(length)):
+                game = StonehengeGame(True)
+            geometry = get_geometry(length)
+            lines = str(game.current_state).splitlines()
+            places = {}
+            for number, line in enumerate(lines):
+                for column, word in enumerate(line):
+                    if word.isalpha() and (column == 0 or
+                                           not line[column - 1].isalpha()):
+                        label = line[column:].split(' ')[0]
+                        places[label] = (number, column)
+            self.assertEqual(sorted(places), sorted(geometry.labels))
+
+            for ley, cells in enumerate(geometry.ley_cells):
+                if geometry.ley_keys[ley][0] == '-':
+                    continue
+                steps = {(places[geometry.labels[second]][0] -
+                          places[geometry.labels[first]][0],
+                          places[geometry.labels[second]][1] -
+                          places[geometry.labels[first]][1])
+                         for first, second in zip(cells, cells[1:])}
+                self.assertEqual(len(steps), 1,
+                                 ("The cells of ley-line {} on a board " +
+                                  "with a side-length of {} are not drawn " +
+                                  "along a straight line:\n{}").format(
+                                      geometry.ley_keys[ley], length,
+                                      '\n'.join(lines)))
+
+            claimed = str(game.current_state.make_move('AA')).splitlines()
+            self.assertEqual([[i for i, c in enumerate(line) if c in '/\\-']
+                              for line in claimed],
+                             [[i for i, c in enumerate(line) if c in '/\\-']
+                              for line in lines])
+
+    def test_symmetric_games_share_canonical(self):
+        """
+        Test that playing the mirror image of every move of a game, under
+        each symmetry of the board, gives states with the same canonical form
+        and the same scores as the original game.
+        """
+        rng = random.Random(0)
+        for length in range(1, 6):
+            geometry = get_geometry(length)
+            for cell_map, _ in geometry.symmetries:
+                with patch('builtins.input', return_value=str(length)):
+                    game = StonehengeGame(True)
+                state = image = game.current_state
+                while state.get_possible_moves():
+                    move = rng.choice(state.get_possible_moves())
+                    state = state.make_move(move)
+                    image = image.make_move(
+                        geometry.labels[cell_map[geometry.cell_index[move]]])
+                    self.assertEqual(state.canonical(), image.canonical(),
+                                     ("{!r} and its mirror image {!r} " +
+                                      "should have the same canonical " +
+                                      "form.").format(state, image))
+                    self.assertEqual((state.p1_score, state.p2_score),
+                                     (image.p1_score, image.p2_score))
+                self.assertEqual(state.canonical().canonical(),
+                                 state.canonical())
+
+
+class BitboardStonehengeUnitTests(unittest.TestCase):
+    def test_bitboard_matches_stonehenge_state(self):
+        """
+        Test that the bitboard state renders, moves and ends exactly like
+        StonehengeState through random games on boards of length 1 to 7.
+        """
+        rng = random.Random(0)
+        for length in range(1, 8):
+            for _ in range(20):
+                with patch('builtins.input', return_value=str(length)):
+                    game = StonehengeGame(True)
+                state = game.current_state
+                bitboard = BitboardStonehengeState(True, length)
+                moves_used = ''
+                while True:
+                    self.assertEqual(str(bitboard), str(state),
+                                     ("The bitboard state after the moves " +
+                                      "{} should render as:\n{}\nbut " +
+                                      "rendered as:\n{}").format(
+                                          moves_used, state, bitboard))
+                    self.assertEqual(bitboard.get_possible_moves(),
+                                     state.get_possible_moves())
+                    self.assertEqual(game.is_over(bitboard),
+                                     game.is_over(state))
+                    if not state.get_possible_moves():
+                        break
+                    move = rng.choice(state.get_possible_moves())
+                    moves_used += move
+                    state = state.make_move(move)
+                    bitboard = bitboard.make_move(move)
+
+    def test_bitboard_from_state(self):
+        """
+        Test that from_state() gives the same bitboard as playing the same
+        moves on a bitboard.
+        """
+        with patch('builtins.input', return_value='2'):
+            game = StonehengeGame(True)
+        state = game.current_state
+        bitboard = BitboardStonehengeState(True, 2)
+        for move in ['A', 'G', 'D']:
+            state = state.make_move(move)
+            bitboard = bitboard.make_move(move)
+
+        self.assertEqual(repr(BitboardStonehengeState.from_state(state)),
+                         repr(bitboard))
+
 
 if __name__ == "__main__":
     unittest.main()
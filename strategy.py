@@ -5,7 +5,12 @@ NOTE: Make sure this file adheres to python-ta.
 Adjust the type annotations as needed, and implement both a recursive
 and an iterative version of minimax.
 """
-from typing import Any, List, Union
+import atexit
+import time
+from collections import deque
+from multiprocessing import Pool, RawValue, current_process
+from typing import Any, List
+from shared_table import SharedTranspositionTable
 # TODO: Adjust the type annotation as needed.
 def interactive_strategy(game: Any) -> 'move':
     """
@@ -32,109 +37,374 @@ class Tree:
         # copy children if not None
         self.children = children.copy() if children else []
 
-def helper_isover(game, state) -> int:
+def state_key(state: Any) -> Any:
     """
-    A helper function that determines whether the state is over or not.
+    Return a hashable key identifying the position of state.
+
+    Two states reached through different move orders get the same key, so
+    the key can be used to look solved positions up in a transposition
+    table. The states of both of our games hash and compare by position, so
+    a state is its own key. A state walked with push() and pop() changes in
+    place, so only states made by make_move() may be used as keys.
     """
-    old_state = game.current_state
-    game.current_state = state  # the state you want to check here
-    if game.current_state.get_current_player_name() == 'p1':
-        player = 'p1'
-        player2 = 'p2'
-    else:
-        player = 'p2'
-        player2 = 'p1'
-    if game.is_winner(player):
-        game.current_state = old_state
-        return 1
-    elif game.is_winner(player2):
-        game.current_state = old_state
-        return -1
-
-    game.current_state = old_state
-    return 0
-    # if game.is_winner(state.get_current_player_name()):
-    #     return 1
-    # elif not game.is_winner(state.get_current_player_name()):
-    #     return -1
-    # return 0
-
-def helper_moves(game, new_state, m) -> None: #branching
-    """
-    A Recursive helper function.
-    """
-    c = helper_rec_state(game, new_state)
-    if type(c) == list:
-        b = max(c) * -1
-    else:
-        b = c * -1
-    m.extend([b])
+    return state
 
-def branch_or_not(game, new_state, m) -> None:
+def helper_negamax(game, state: 'State', table: dict = None) -> int:
     """
-    A Recursive helper function
+    Return the score of state for the player whose turn it is, assuming
+    both players play perfectly from here on.
+
+    Each child of state is searched exactly once and its score negated,
+    since a position that is good for the opponent is bad for us.
+
+    If table is given, it is used as a transposition table: the score for
+    every position solved is stored under state_key(state), and a position
+    that is reached again through another move order is looked up instead
+    of being searched a second time.
+    """
+    if game.is_over(state): #base case
+        return game.terminal_value(state)
+    if table is not None:
+        key = state_key(state)
+        score = table.get(key)
+        if score is not None:
+            return score
+    score = max([helper_negamax(game, state.make_move(move), table) * -1
+                 for move in state.get_possible_moves()])
+    if table is not None:
+        table[key] = score
+    return score
+
+
+def minimax_rec(game: Any) -> 'move':
+    """
+    A recursive minimax that returns best move.
+
+    Positions are memoized in a transposition table for the duration of the
+    search, so each distinct position is only expanded once no matter how
+    many move orders lead to it.
+    """
+    table = {}
+    current_state = game.current_state
+    best_move = None
+    best_score = -2
+    for move in current_state.get_possible_moves():
+        score = helper_negamax(game, current_state.make_move(move), table) * -1
+        if score > best_score:
+            best_move = move
+            best_score = score
+        if best_score == current_state.WIN:
+            break
+    return best_move
+
+# A root with fewer moves than this is searched by minimax_rec, as handing
+# the moves to the pool would cost more than it saves.
+PARALLEL_MIN_MOVES = 4
+# How many positions a worker searches between checks for cancellation
+_CANCEL_CHECK_INTERVAL = 1024
+
+# The pool, transposition table and search counter shared by every call of
+# minimax_parallel in this process, made on the first call
+_pool = None
+_pool_processes = None
+_pool_table = None
+_search_number = None
+
+# The table and search counter of a worker process of minimax_parallel
+_worker_table = None
+_worker_search_number = None
+
+
+class _SearchCancelled(Exception):
+    """
+    Raised inside a worker's search once the search it belongs to is over.
+    """
+    pass
+
+
+class _CancellableTable:
+    """
+    A transposition table that passes lookups and stores on to table, and
+    every _CANCEL_CHECK_INTERVAL lookups raises _SearchCancelled if search
+    is no longer the search being run.
     """
-    if type(helper_rec_state(game, new_state)) == int:
-        m.append(helper_rec_state(game, new_state) * -1)
-    else:
-        # c = helper_rec_state(game, new_state)
-        # if type(c) == list:
-        #     b = max(c) * -1
-        # else:
-        #     b = c * -1
-        # m.extend([b])
-        helper_moves(game, new_state, m)
 
-def helper_rec_state(game, state: 'State') -> Union[List[int], int]:
+    def __init__(self, table: Any, search: int) -> None:
+        self.table = table
+        self.search = search
+        self.lookups = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Return the score stored under key, or default if there is none.
+        """
+        self.lookups += 1
+        if self.lookups % _CANCEL_CHECK_INTERVAL == 0 and \
+                _worker_search_number.value != self.search:
+            raise _SearchCancelled
+        return self.table.get(key, default)
+
+    def __setitem__(self, key: Any, score: int) -> None:
+        self.table[key] = score
+
+
+def _init_worker(table: SharedTranspositionTable, search_number: Any) -> None:
+    """
+    Start a worker process of minimax_parallel, searching with table and
+    reading the number of the current search from search_number.
+    """
+    global _worker_table, _worker_search_number
+    _worker_table = table
+    _worker_search_number = search_number
+
+
+def _solve_root_move(job: tuple) -> tuple:
+    """
+    Return (index, score) for job, a (search, index, game, move, table)
+    tuple: the score for the player to move in game.current_state of making
+    move, the index-th of the possible moves, or None if search was
+    cancelled first. If table is None, the worker's own table is used.
+    """
+    search, index, game, move, table = job
+    if _worker_search_number.value != search:
+        return index, None
+    if table is None:
+        table = _worker_table
+    child = game.current_state.make_move(move)
+    try:
+        score = helper_negamax(game, child,
+                               _CancellableTable(table, search)) * -1
+    except _SearchCancelled:
+        score = None
+    return index, score
+
+
+def _close_shared_pool() -> None:
+    """
+    Stop the pool of minimax_parallel and free its table.
     """
-    Recursive helper function
+    global _pool, _pool_table
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+    if _pool_table is not None:
+        _pool_table.close()
+        _pool_table.unlink()
+        _pool_table = None
+
+
+def _shared_pool(processes: int = None) -> Pool:
+    """
+    Return the pool of processes workers that minimax_parallel uses, making
+    it the first time or when a different number of workers is asked for.
+    """
+    global _pool, _pool_processes, _pool_table, _search_number
+    if _pool is not None and _pool_processes == processes:
+        return _pool
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+    if _pool_table is None:
+        _pool_table = SharedTranspositionTable()
+        _search_number = RawValue('q', 0)
+        atexit.register(_close_shared_pool)
+    _pool = Pool(processes, initializer=_init_worker,
+                 initargs=(_pool_table, _search_number))
+    _pool_processes = processes
+    return _pool
+
+
+def minimax_parallel(game: Any, processes: int = None,
+                     table: SharedTranspositionTable = None) -> Any:
+    """
+    A minimax that returns the same move as minimax_rec, solving the root's
+    children on a pool of processes worker processes (one per core if
+    processes is None) at the same time.
+
+    The pool is made on the first call and kept for later calls, together
+    with a transposition table in shared memory, so a position solved by
+    one worker, in this search or an earlier one, is not solved again. If
+    table is given, it is used for this search instead.
+
+    minimax_rec picks the first move with the best score, so once a move is
+    proven to win and every move before it has been solved, the answer is
+    known: the search is then cancelled, and the workers give up on the
+    moves they are still solving.
+
+    A root with fewer than PARALLEL_MIN_MOVES moves is searched by
+    minimax_rec. So is any root inside a worker process of a pool (e.g. in
+    a tournament), as such processes cannot start pools of their own.
+    """
+    current_state = game.current_state
+    moves = current_state.get_possible_moves()
+    if current_process().daemon or len(moves) < PARALLEL_MIN_MOVES:
+        return minimax_rec(game)
+    pool = _shared_pool(processes)
+    _search_number.value += 1
+    search = _search_number.value
+    scores = [None] * len(moves)
+    solved = 0
+    try:
+        jobs = [(search, index, game, move, table)
+                for index, move in enumerate(moves)]
+        for index, score in pool.imap_unordered(_solve_root_move, jobs):
+            scores[index] = score
+            while solved < len(moves) and scores[solved] is not None:
+                if scores[solved] == current_state.WIN:
+                    return moves[solved]
+                solved += 1
+    finally:
+        # Tell the workers to drop whatever is left of this search
+        _search_number.value += 1
+    best = max(range(len(moves)), key=lambda i: (scores[i], -i))
+    return moves[best]
+
+def helper_alphabeta(game, state: 'State', alpha: int, beta: int,
+                     table: dict) -> int:
+    """
+    Return the score of state for the player whose turn it is, searching
+    only as much of the tree as is needed to decide whether the score lies
+    within (alpha, beta).
+
+    A score at or below alpha is an upper bound on the true score, and a
+    score at or above beta is a lower bound. Since a score can never exceed
+    WIN, a child that is proven to be a win for us cuts off the remaining
+    children straight away.
+
+    table maps state_key(state) to a (lower, upper) pair of bounds on the
+    score of every position searched so far.
     """
     if game.is_over(state): #base case
-        return helper_isover(game, state)
+        return game.terminal_value(state)
+    key = state_key(state)
+    lower, upper = table.get(key, (state.LOSE, state.WIN))
+    if lower >= beta or lower == upper:
+        return lower
+    if upper <= alpha:
+        return upper
+    alpha = max(alpha, lower)
+    beta = min(beta, upper)
+
+    best_score = state.LOSE - 1
+    window_alpha = alpha
+    for move in state.get_possible_moves():
+        score = helper_alphabeta(game, state.make_move(move),
+                                 beta * -1, window_alpha * -1, table) * -1
+        best_score = max(best_score, score)
+        window_alpha = max(window_alpha, score)
+        if window_alpha >= beta:
+            break
+
+    if best_score <= alpha:
+        table[key] = (lower, best_score)
+    elif best_score >= beta:
+        table[key] = (best_score, upper)
     else:
-        possible_moves = state.get_possible_moves()
-        l = [] #final List[int] that is returned,
-        # corresponding to each moves' score.
-        if len(possible_moves) > 1:
-            for move in possible_moves:
-                m = []
-                new_state = state.make_move(move)
-                # if type(helper_rec_state(game, new_state)) == int:
-                #     m.append(helper_rec_state(game, new_state) * -1)
-                # else:
-                #     # c = helper_rec_state(game, new_state)
-                #     # if type(c) == list:
-                #     #     b = max(c) * -1
-                #     # else:
-                #     #     b = c * -1
-                #     # m.extend([b])
-                #     helper_moves(game, new_state, m)
-                branch_or_not(game, new_state, m)
-                m = max(m)
-                l.append(m)
-            return l
-        else: #a state has only one possible moves
-            new_state = state.make_move(possible_moves[0])
-            a = helper_rec_state(game, new_state)
-            if type(a) == list:
-                b = a[0] * -1
-            else:
-                b = -1 * a
-            return [b]
+        table[key] = (best_score, best_score)
+    return best_score
 
 
-def minimax_rec(game: Any) -> 'move':
+def minimax_ab(game: Any) -> Any:
     """
-    A recursive minimax that returns best move.
+    A recursive minimax with alpha-beta pruning that returns best move.
+
+    It returns a move of the same score as minimax_rec, but stops looking at
+    a position's children as soon as one of them is proven to decide the
+    score of that position.
+    """
+    table = {}
+    current_state = game.current_state
+    best_move = None
+    best_score = current_state.LOSE - 1
+    for move in current_state.get_possible_moves():
+        score = helper_alphabeta(game, current_state.make_move(move),
+                                 current_state.WIN * -1,
+                                 max(best_score, current_state.LOSE) * -1,
+                                 table) * -1
+        if score > best_score:
+            best_move = move
+            best_score = score
+        if best_score == current_state.WIN:
+            break
+    return best_move
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside a search when its time budget has run out.
+    """
+    pass
+
+
+def helper_depth_limited(game, state: 'State', depth: int, alpha: float,
+                         beta: float, deadline: float,
+                         horizon: List[int]) -> float:
+    """
+    Return the score of state for the player whose turn it is, searching at
+    most depth moves ahead and guessing the score of the positions at that
+    depth with rough_outcome().
+
+    Each time rough_outcome() stands in for a deeper search, horizon[0] is
+    increased, so the caller can tell whether the score is exact.
+
+    Raise _SearchTimeout once time.monotonic() passes deadline.
     """
-    score_lst = helper_rec_state(game, game.current_state)
-    #List of score (int)
-    possible_lst = game.current_state.get_possible_moves()
-    #List of corresponding moves
-    for i in range(len(score_lst)):
-        if score_lst[i] == 1:
-            return possible_lst[i] #return move that corresponds to 1
-    return possible_lst[-1]
+    if game.is_over(state): #base case
+        return game.terminal_value(state)
+    if time.monotonic() > deadline:
+        raise _SearchTimeout
+    if depth == 0:
+        horizon[0] += 1
+        return state.rough_outcome()
+
+    best_score = state.LOSE - 1
+    for move in state.get_possible_moves():
+        score = helper_depth_limited(game, state.make_move(move), depth - 1,
+                                     beta * -1, alpha * -1, deadline,
+                                     horizon) * -1
+        best_score = max(best_score, score)
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+    return best_score
+
+
+def iterative_deepening(game: Any, time_limit: float = 1.0) -> Any:
+    """
+    Return a move for game by searching 1, 2, 3, ... moves ahead until
+    time_limit seconds have passed, guessing the score of positions at the
+    depth limit with rough_outcome().
+
+    The move returned is the best move of the deepest search that finished in
+    time. Each search looks at the previous best move first. The deepening
+    stops early once a search reaches the end of the game everywhere, as its
+    result is then exact.
+    """
+    deadline = time.monotonic() + time_limit
+    current_state = game.current_state
+    moves = current_state.get_possible_moves()
+    best_move = moves[0]
+    depth = 0
+    horizon = [1]
+    while horizon[0] > 0:
+        depth += 1
+        horizon[0] = 0
+        iteration_move = None
+        best_score = current_state.LOSE - 1
+        try:
+            for move in moves:
+                score = helper_depth_limited(
+                    game, current_state.make_move(move), depth - 1,
+                    current_state.WIN * -1, best_score * -1, deadline,
+                    horizon) * -1
+                if score > best_score:
+                    iteration_move = move
+                    best_score = score
+        except _SearchTimeout:
+            break
+        best_move = iteration_move
+        moves = [best_move] + [m for m in moves if m != best_move]
+    return best_move
 
 def rough_outcome_strategy(game: Any) -> Any:
     """
@@ -173,6 +443,94 @@ def rough_outcome_strategy(game: Any) -> Any:
     # Return the move that resulted in the best rough_outcome
     return best_move
 
+class SearchStats:
+    """
+    Counters that a search fills in as it runs, to measure its throughput.
+
+    nodes - the number of positions looked at
+    seconds - the wall-clock time spent searching
+    """
+    nodes: int
+    seconds: float
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.seconds = 0.0
+
+    def nodes_per_second(self) -> float:
+        """
+        Return the number of positions looked at per second of searching.
+        """
+        if self.seconds == 0:
+            return 0.0
+        return self.nodes / self.seconds
+
+
+# The number of positions streaming iterative minimax remembers at most: two
+# for each of this many buckets, which must be a power of two
+STREAMING_TABLE_SIZE = 1 << 18
+# An odd 64-bit multiplier whose bits look random, to spread hashes out
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+class _BoundedTable:
+    """
+    A transposition table of a fixed number of buckets of two positions.
+    A position is kept, as its hash and score, in the bucket that the top
+    bits of its hash times _HASH_MULTIPLIER pick, so hashes that differ only
+    in their low bits, like those of small ints, still land in different
+    buckets. A new position pushes the older of its bucket's two positions
+    out, so the table holds no states and never more than 2 * size
+    positions however many are searched. As in SharedTranspositionTable,
+    positions are told apart by their hashes alone. Buckets are only made
+    once they are used.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.shift = 64 - (size.bit_length() - 1)
+        self.buckets = {}
+
+    def _bucket(self, key_hash: int) -> int:
+        """
+        Return the index of the bucket for the hash key_hash.
+        """
+        return ((key_hash & _MASK_64) * _HASH_MULTIPLIER & _MASK_64) >> \
+            self.shift
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Return the score stored under key, or default if there is none.
+        """
+        key_hash = hash(key)
+        bucket = self.buckets.get(self._bucket(key_hash))
+        if bucket is None:
+            return default
+        if bucket[0] == key_hash:
+            return bucket[1]
+        if bucket[2] == key_hash:
+            return bucket[3]
+        return default
+
+    def __setitem__(self, key: Any, score: Any) -> None:
+        """
+        Store score under key, pushing the older position of its bucket out
+        if key is not in the bucket already.
+        """
+        key_hash = hash(key)
+        index = self._bucket(key_hash)
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            self.buckets[index] = [key_hash, score, None, None]
+        elif bucket[0] == key_hash:
+            bucket[1] = score
+        elif bucket[2] == key_hash:
+            bucket[3] = score
+        else:
+            bucket[2:] = bucket[:2]
+            bucket[:2] = [key_hash, score]
+
+
 class _Container():
     """
     A bare-bones Tree-like ADT, similar to that from lecture.
@@ -180,76 +538,77 @@ class _Container():
     @param int score: current score
     @param object state: [value, player's turn]
     @param list[Tree|None] children: child nodes
+    @param object move: the move that led to state, or None for the root
     """
 
     def __init__(self, state: 'State', score: object = None,
-                 children: List['Tree'] = None) -> None:
+                 children: List['Tree'] = None, move: Any = None) -> None:
         self.state = state
         self.score = score
         self.children = children.copy() if children else []
+        self.move = move
 
 
-def minimax_iter(game: Any) -> Any:
+def minimax_iter(game: Any, stats: 'SearchStats' = None,
+                 streaming: bool = True) -> Any:
     """
     A itenrative minimax that returns best move.
+
+    The containers waiting to be looked at are kept on a deque used as a
+    stack, so pushing and popping a container takes constant time. A
+    container is popped once before its children are looked at, and once
+    more after all of them have been scored. Scored positions are kept in a
+    transposition table, so a position reached again is not expanded again.
+
+    If streaming is True, a container lets go of its children as soon as its
+    own score has been worked out from them, so only the containers along
+    the path being searched and their siblings are kept alive, and the table
+    keeps at most 2 * STREAMING_TABLE_SIZE positions. Peak memory then stays
+    the same however many positions are searched. Otherwise the whole
+    search tree, and every position scored, is kept until the search is
+    done.
+
+    If stats is given, it is filled in with the number of containers looked
+    at and the time the search took.
     """
-    old_state = game.current_state
+    start = time.monotonic()
+    table = _BoundedTable(STREAMING_TABLE_SIZE) if streaming else {}
+    nodes = 1
     current = _Container(game.current_state)
-    stack = []
-    stack.append(current)
+    stack = deque([current])
     _last = None
-    while stack != []:
-        _last = stack.pop(0)
-        if game.is_over(_last.state):
-            game.current_state = _last.state # the state you want to check here
-            if game.current_state.get_current_player_name() == 'p1':
-                player = 'p1'
-                player2 = 'p2'
-            else:
-                player = 'p2'
-                player2 = 'p1'
-            if game.is_winner(player):
-                game.current_state = old_state
-                _last.score = 1
-            elif game.is_winner(player2):
-                game.current_state = old_state
-                _last.score = -1
-            else:
-                game.current_state = old_state
-                _last.score = 0
-            # if game.is_winner(_last.state.get_current_player_name()):
-            #     _last.score = 1
-            # elif not game.is_winner(_last.state.get_current_player_name()):
-            #     _last.score = -1
-            # else:
-            #     _last.score = 0
-
-        elif _last.children == []: #havent look yet
-            last_state = _last.state
-            temp = [_last]
-            for move in last_state.get_possible_moves():
-                children_container = _Container(last_state.make_move(move))
-                _last.children.append(children_container)
-                temp.append(children_container)
-            for i in temp:
-                stack.insert(0, i)
-
-            # p2 = [c.state.current_total for c in stack]
-            # print(p2[:])
-            # [print(s.score) for s in stack]
-        elif _last.children != []: #has children, looked before
+    while stack:
+        _last = stack.pop()
+        if _last.children: #has children, looked before
             _last.score = max([(x.score * -1) for x in _last.children])
+            table[state_key(_last.state)] = _last.score
+            if streaming and _last is not current:
+                _last.children = []
+        elif game.is_over(_last.state):
+            _last.score = game.terminal_value(_last.state)
+        else:
+            known = None if _last is current else \
+                table.get(state_key(_last.state))
+            if known is not None:
+                _last.score = known
+            else: #havent look yet
+                last_state = _last.state
+                for move in last_state.get_possible_moves():
+                    _last.children.append(
+                        _Container(last_state.make_move(move), move=move))
+                nodes += len(_last.children)
+                stack.append(_last)
+                stack.extend(_last.children)
+
+    if stats is not None:
+        stats.nodes += nodes
+        stats.seconds += time.monotonic() - start
 
-    # print("stack is empty!!!!!!!!!!!!!!")
     last_children_final = _last.children[-1]
     for c in _last.children:
         if c.score * -1 == _last.score:
             last_children_final = c
-
-    for mm in _last.state.get_possible_moves():
-        if repr(_last.state.make_move(mm)) == \
-                repr(last_children_final.state):
-            return mm
+    return last_children_final.move
 
 if __name__ == "__main__":
     from python_ta import check_all
@@ -12,16 +12,21 @@ class SubtractSquareGame(Game):
     Abstract class for a game to be played with two players.
     """
 
-    def __init__(self, p1_starts):
+    def __init__(self, p1_starts, current_total=None):
         """
         Initialize this Game, using p1_starts to find who the first player is.
+        The user is asked for the starting total unless current_total is
+        given.
 
         :param p1_starts: A boolean representing whether Player 1 is the first
                           to make a move.
         :type p1_starts: bool
+        :param current_total: The number to subtract from, or None to ask.
+        :type current_total: int | None
         """
-        count = int(input("Enter the number to subtract from: "))
-        self.current_state = SubtractSquareState(p1_starts, count)
+        if current_total is None:
+            current_total = int(input("Enter the number to subtract from: "))
+        self.current_state = SubtractSquareState(p1_starts, current_total)
 
     def get_instructions(self):
         """
@@ -54,8 +59,24 @@ class SubtractSquareGame(Game):
         :return: Whether player has won or not.
         :rtype: bool
         """
-        return (self.current_state.get_current_player_name() != player
-                and self.is_over(self.current_state))
+        return self.winner(self.current_state) == player
+
+    def winner(self, state):
+        """
+        Return the player who has won the game at state, or None if the game
+        is not over at state. The player who subtracts to 0 wins, so the
+        winner is the player who is not to move.
+
+        :param state: The state to check.
+        :type state: SubtractSquareState
+        :return: 'p1', 'p2' or None.
+        :rtype: str | None
+        """
+        if not self.is_over(state):
+            return None
+        if state.get_current_player_name() == 'p1':
+            return 'p2'
+        return 'p1'
 
     def str_to_move(self, string):
         """
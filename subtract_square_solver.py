@@ -0,0 +1,107 @@
+"""
+A solver for SubtractSquare.
+
+The outcome of a position in SubtractSquare only depends on its current
+total, so it can be worked out once for every total and looked up from then
+on.
+
+NOTE: You do not have to run python-ta on this file.
+"""
+from math import isqrt
+from typing import Any, List
+from strategy import minimax_ab
+
+
+class SubtractSquareSolver:
+    """
+    A table of the outcome of SubtractSquare for every total up to a limit.
+
+    wins - wins[n] is whether the player to move from a total of n can
+           force a win
+    """
+    wins: List[bool]
+
+    def __init__(self, limit: int = 0) -> None:
+        """
+        Initialize this solver with the outcome of every total up to limit.
+        """
+        self.wins = [False]
+        self.extend(limit)
+
+    def extend(self, limit: int) -> None:
+        """
+        Add the outcome of every total up to limit that is not in the table
+        yet. Totals that are already solved are not looked at again.
+
+        A total is a win if some square leads to a total that is a loss for
+        the opponent, so solving a total n looks at most sqrt(n) entries.
+        """
+        wins = self.wins
+        for total in range(len(wins), limit + 1):
+            win = False
+            for root in range(1, isqrt(total) + 1):
+                if not wins[total - root * root]:
+                    win = True
+                    break
+            wins.append(win)
+
+    def is_win(self, total: int) -> bool:
+        """
+        Return whether the player to move from total can force a win.
+
+        >>> SubtractSquareSolver().is_win(18)
+        True
+        >>> SubtractSquareSolver().is_win(5)
+        False
+        """
+        if total >= len(self.wins):
+            self.extend(total)
+        return self.wins[total]
+
+    def winning_moves(self, total: int) -> List[int]:
+        """
+        Return every square that can be subtracted from total to leave the
+        opponent in a losing position.
+
+        >>> SubtractSquareSolver().winning_moves(18)
+        [1, 16]
+        """
+        if total >= len(self.wins):
+            self.extend(total)
+        return [root * root for root in range(1, isqrt(total) + 1)
+                if not self.wins[total - root * root]]
+
+    def best_move(self, total: int) -> int:
+        """
+        Return a winning move from total if there is one. Otherwise return 1,
+        which makes the game last as long as possible.
+
+        Precondition: total > 0
+        """
+        moves = self.winning_moves(total)
+        if moves:
+            return moves[0]
+        return 1
+
+
+# The solver shared by all SubtractSquare states and strategies, so the table
+# is only built once per process.
+SOLVER = SubtractSquareSolver()
+
+
+def perfect_play_strategy(game: Any) -> int:
+    """
+    Return a move for a game of SubtractSquare that plays perfectly, by
+    looking the current total up in the shared solver. Any other game has
+    no such table, so its move is found by minimax_ab, which plays just as
+    well but has to search for it.
+    """
+    total = getattr(game.current_state, 'current_total', None)
+    if total is None:
+        return minimax_ab(game)
+    return SOLVER.best_move(total)
+
+
+if __name__ == "__main__":
+    from python_ta import check_all
+    check_all(config="a2_pyta.txt")
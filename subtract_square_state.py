@@ -3,14 +3,27 @@ An implementation of a state for SubtractSquare.
 
 NOTE: You do not have to run python-ta on this file.
 """
-from typing import Any
+from math import isqrt
+from typing import Any, List, Optional
 from game_state import GameState
+from subtract_square_solver import SOLVER
+
+# _MOVES[k] is the list of the first k positive squares. Every total whose
+# integer square root is k shares the list _MOVES[k] as its possible moves.
+_MOVES = [[]]
 
 
 class SubtractSquareState(GameState):
     """
     The state of a game at a certain point in time.
+
+    current_total - the total left to subtract squares from
+    history - the moves pushed onto this state and not popped yet, or None
+              if no move has been pushed
     """
+    __slots__ = ('current_total', 'history')
+    current_total: int
+    history: Optional[List[int]]
 
     def __init__(self, is_p1_turn: bool, current_total: int) -> None:
         """
@@ -19,6 +32,22 @@ class SubtractSquareState(GameState):
         """
         super().__init__(is_p1_turn)
         self.current_total = current_total
+        self.history = None
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Return whether other is a SubtractSquareState with the same total and
+        the same player to move.
+        """
+        return (type(other) == type(self) and
+                self.current_total == other.current_total and
+                self.p1_turn == other.p1_turn)
+
+    def __hash__(self) -> int:
+        """
+        Return a hash of this state's total and player to move.
+        """
+        return hash((self.current_total, self.p1_turn))
 
     def __str__(self) -> str:
         """
@@ -29,13 +58,27 @@ class SubtractSquareState(GameState):
     def get_possible_moves(self) -> list:
         """
         Return all possible moves that can be applied to this state.
+
+        The list returned is shared with every other state whose total has
+        the same integer square root, so it must not be modified.
+
+        >>> SubtractSquareState(True, 10).get_possible_moves()
+        [1, 4, 9]
         """
-        moves = []
-        for i in range(1, self.current_total + 1):
-            if i ** 2 <= self.current_total:
-                moves.append(i ** 2)
+        return possible_moves(self.current_total)
 
-        return moves
+    def is_valid_move(self, move: Any) -> bool:
+        """
+        Return whether move is a valid move for this GameState, i.e. a
+        positive square that is at most the current total.
+
+        >>> SubtractSquareState(True, 10).is_valid_move(9)
+        True
+        >>> SubtractSquareState(True, 10).is_valid_move(16)
+        False
+        """
+        return (type(move) == int and 0 < move <= self.current_total
+                and isqrt(move) ** 2 == move)
 
     def make_move(self, move: Any) -> "SubtractSquareState":
         """
@@ -44,10 +87,41 @@ class SubtractSquareState(GameState):
         if type(move) == str:
             move = int(move)
 
-        new_state = SubtractSquareState(not self.p1_turn,
-                                        self.current_total - move)
+        new_state = SubtractSquareState.__new__(SubtractSquareState)
+        new_state.p1_turn = not self.p1_turn
+        new_state.current_total = self.current_total - move
+        new_state.history = None
         return new_state
 
+    def push(self, move: Any) -> None:
+        """
+        Apply move to this state in place, so that pop() can undo it.
+
+        >>> s = SubtractSquareState(True, 10)
+        >>> s.push(9)
+        >>> s.current_total, s.p1_turn
+        (1, False)
+        >>> s.pop()
+        >>> s.current_total, s.p1_turn
+        (10, True)
+        """
+        if type(move) == str:
+            move = int(move)
+        if self.history is None:
+            self.history = []
+        self.history.append(move)
+        self.current_total -= move
+        self.p1_turn = not self.p1_turn
+
+    def pop(self) -> None:
+        """
+        Undo the last move applied to this state by push().
+
+        Precondition: a move has been pushed and not popped yet.
+        """
+        self.current_total += self.history.pop()
+        self.p1_turn = not self.p1_turn
+
     def __repr__(self) -> str:
         """
         Return a representation of this state (which can be used for
@@ -60,15 +134,13 @@ class SubtractSquareState(GameState):
         """
         Return an estimate in interval [LOSE, WIN] of best outcome the current
         player can guarantee from state self.
+
+        The outcome of every total is looked up in the shared solver, so the
+        estimate is always exact.
         """
-        if is_pos_square(self.current_total):
+        if SOLVER.is_win(self.current_total):
             return self.WIN
-        elif all([is_pos_square(self.current_total - n ** 2)
-                  for n in range(1, self.current_total + 1)
-                  if n ** 2 < self.current_total]):
-            return self.LOSE
-
-        return self.DRAW
+        return self.LOSE
 
 
 def is_pos_square(n: int) -> bool:
@@ -80,7 +152,26 @@ def is_pos_square(n: int) -> bool:
     >>> is_pos_square(9)
     True
     """
-    return 0 < n and (round(n ** 0.5) ** 2 == n)
+    return 0 < n and isqrt(n) ** 2 == n
+
+
+def possible_moves(total: int) -> List[int]:
+    """
+    Return the positive squares that are at most total, in increasing order.
+
+    Only the squares up to isqrt(total) are looked at, and the list is
+    cached and shared between every total with the same integer square root.
+
+    >>> possible_moves(17)
+    [1, 4, 9, 16]
+    >>> possible_moves(0)
+    []
+    """
+    root = isqrt(total) if total > 0 else 0
+    while len(_MOVES) <= root:
+        size = len(_MOVES)
+        _MOVES.append(_MOVES[-1] + [size * size])
+    return _MOVES[root]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+"""
+A subset of unittests used for testing SubtractSquare and its solver.
+
+These unittests only test for basic functionality. They are not a guarantee
+that the code works flawlessly.
+"""
+import unittest
+from unittest.mock import patch
+
+from game_interface import (make_game, make_interface, playable_games,
+                            usable_strategies)
+from subtract_square_solver import SubtractSquareSolver, perfect_play_strategy
+from self_play import self_play
+SubtractSquareGame = playable_games['s']
+minimax_recursive_strategy = usable_strategies['mr']
+
+
+class SubtractSquareStateUnitTests(unittest.TestCase):
+    def test_get_possible_moves(self):
+        """
+        Test that get_possible_moves() returns every square up to the total,
+        in increasing order.
+        """
+        for total in range(0, 300):
+            with patch('builtins.input', return_value=str(total)):
+                game = SubtractSquareGame(True)
+            expected = [i * i for i in range(1, total + 1) if i * i <= total]
+            moves = game.current_state.get_possible_moves()
+
+            self.assertEqual(moves, expected,
+                             ("get_possible_moves() with a total of {} " +
+                              "should return {}, but returned {}.").format(
+                                  total, expected, moves))
+
+    def test_is_valid_move(self):
+        """
+        Test that is_valid_move() accepts exactly the possible moves.
+        """
+        with patch('builtins.input', return_value='30'):
+            game = SubtractSquareGame(True)
+        state = game.current_state
+        for move in [-4, 0, 1, 2, 4, 8, 25, 36, None, '4']:
+            expected = move in state.get_possible_moves()
+            self.assertEqual(state.is_valid_move(move), expected,
+                             ("is_valid_move({!r}) with a total of 30 " +
+                              "should return {}.").format(move, expected))
+
+    def test_transposed_states_equal(self):
+        """
+        Test that the same total and player to move give equal states with
+        equal hashes, whatever moves led there.
+        """
+        with patch('builtins.input', return_value='30'):
+            game = SubtractSquareGame(True)
+        first = game.current_state.make_move(1).make_move(4)
+        second = game.current_state.make_move(4).make_move(1)
+
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, first.make_move(1).make_move(0))
+
+    def test_push_pop(self):
+        """
+        Test that push() and pop() walk the same states as make_move().
+        """
+        with patch('builtins.input', return_value='30'):
+            game = SubtractSquareGame(True)
+        board = game.current_state
+        states = [type(board)(True, 30)]
+        for move in [25, 4, 1]:
+            board.push(move)
+            states.append(states[-1].make_move(move))
+            self.assertEqual(board, states[-1])
+        for state in reversed(states[1:]):
+            self.assertEqual(board, state)
+            board.pop()
+        self.assertEqual(board, states[0])
+
+    @patch('builtins.input', side_effect=AssertionError("input() was called"))
+    def test_construct_without_input(self, input):
+        """
+        Test that games and game interfaces given all of their options are
+        built without asking for input.
+        """
+        game = SubtractSquareGame(False, current_total=18)
+        self.assertEqual(game.current_state.current_total, 18)
+        self.assertFalse(game.current_state.p1_turn)
+
+        game = make_game('s', 7)
+        self.assertEqual(repr(game.current_state),
+                         repr(SubtractSquareGame(True, 7).current_state))
+
+        interface = make_interface('s', 'mr', 'ab', 9, False)
+        self.assertEqual(interface.game.current_state.current_total, 9)
+        self.assertEqual(interface.game.current_state.get_current_player_name(),
+                         'p2')
+        self.assertIs(interface.p2_strategy, usable_strategies['ab'])
+
+    @patch('builtins.input', side_effect=AssertionError("input() was called"))
+    def test_construct_without_size(self, input):
+        """
+        Test that games and game interfaces asked for without a size raise
+        TypeError instead of asking for one.
+        """
+        with self.assertRaises(TypeError):
+            make_game('s')
+        with self.assertRaises(TypeError):
+            make_interface('s', 'mr', 'ab')
+        with self.assertRaises(TypeError):
+            make_game('h', p1_starts=False)
+
+
+class SubtractSquareSolverUnitTests(unittest.TestCase):
+    def test_solver_matches_minimax(self):
+        """
+        Test that the solver's winning moves agree with recursive minimax for
+        every total up to 60.
+        """
+        solver = SubtractSquareSolver(60)
+        for total in range(1, 61):
+            with patch('builtins.input', return_value=str(total)):
+                game = SubtractSquareGame(True)
+            minimax_move = minimax_recursive_strategy(game)
+            minimax_wins = not solver.is_win(total - minimax_move)
+
+            self.assertEqual(solver.is_win(total), minimax_wins,
+                             ("The solver gives is_win({}) == {}" +
+                              ", but minimax says {}.").format(
+                                  total, solver.is_win(total), minimax_wins))
+
+    def test_solver_grows_on_demand(self):
+        """
+        Test that asking for a total past the end of the table extends it.
+        """
+        solver = SubtractSquareSolver(10)
+        self.assertEqual(len(solver.wins), 11)
+
+        self.assertTrue(solver.is_win(1000) in [True, False])
+        self.assertEqual(len(solver.wins), 1001,
+                         "Looking up a total of 1000 should extend the " +
+                         "table to 1001 entries.")
+
+    def test_perfect_play_strategy(self):
+        """
+        Test the perfect play strategy on a game of SubtractSquare with a
+        value of 18. The chosen move should be 16 or 1, as picking 4 or 9 will
+        result in a loss.
+        """
+        with patch('builtins.input', return_value='18'):
+            game = SubtractSquareGame(True)
+
+        move_chosen = perfect_play_strategy(game)
+        self.assertTrue(move_chosen in [1, 16],
+                        ("The perfect play strategy chose {} from a total of " +
+                         "18, but only 1 and 16 win.").format(move_chosen))
+
+    def test_perfect_play_registered(self):
+        """
+        Test that the perfect play strategy can be picked by its key, wins
+        the games of self-play it can force, and falls back on alpha-beta
+        minimax on Stonehenge.
+        """
+        self.assertIs(usable_strategies['pp'], perfect_play_strategy)
+        for record in self_play('s', 'pp', 'ab', 3, 18):
+            self.assertEqual(record.winner, 'p1')
+
+        game = make_game('h', 2)
+        game.current_state = game.current_state.make_move('B')
+        self.assertEqual(perfect_play_strategy(game),
+                         usable_strategies['ab'](game))
+
+    def test_rough_outcome_is_exact(self):
+        """
+        Test that rough_outcome() gives the exact outcome of a total.
+        """
+        with patch('builtins.input', return_value='5'):
+            game = SubtractSquareGame(True)
+        self.assertEqual(game.current_state.rough_outcome(),
+                         game.current_state.LOSE,
+                         "A total of 5 is a loss for the player to move.")
+
+        state = game.current_state.make_move(4)
+        self.assertEqual(state.rough_outcome(), state.WIN,
+                         "A total of 1 is a win for the player to move.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+A round-robin tournament between strategies, played on a pool of worker
+processes.
+
+Every pair of strategies plays each other on every board size asked for,
+with each strategy taking each seat and each player moving first, so that
+no strategy is favoured by who it plays as. The games are independent, so
+they are spread over the workers one at a time.
+
+    python tournament.py ro ab mr --lengths 1 2 --totals 10 20
+
+NOTE: You do not have to run python_ta on this file.
+"""
+import argparse
+from itertools import permutations
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from game_interface import make_game, usable_strategies
+from self_play import play_game
+
+# A match is (game key, size, p1's strategy key, p2's strategy key, whether
+# p1 moves first); the size is the starting total or the side length.
+Match = Tuple[str, int, str, str, bool]
+
+INITIAL_ELO = 1500.0
+
+
+def schedule(strategies: Sequence[str], lengths: Sequence[int] = (),
+             totals: Sequence[int] = ()) -> List[Match]:
+    """
+    Return the matches of a round-robin between the strategies with the
+    keys strategies: Stonehenge on each side length in lengths and
+    SubtractSquare on each starting total in totals.
+
+    >>> len(schedule(['ro', 'ab', 'mr'], [2], [10, 20]))
+    36
+    """
+    sizes = [('h', length) for length in lengths] + \
+        [('s', total) for total in totals]
+    return [(game_key, size, p1_key, p2_key, p1_starts)
+            for game_key, size in sizes
+            for p1_key, p2_key in permutations(strategies, 2)
+            for p1_starts in [True, False]]
+
+
+def play_match(match: Match) -> Optional[str]:
+    """
+    Play match and return the key of the winning strategy, or None if
+    nobody won.
+    """
+    game_key, size, p1_key, p2_key, p1_starts = match
+    game = make_game(game_key, size, p1_starts)
+    winner = play_game(game, usable_strategies[p1_key],
+                       usable_strategies[p2_key]).winner
+    if winner == 'p1':
+        return p1_key
+    elif winner == 'p2':
+        return p2_key
+    return None
+
+
+def run_tournament(matches: List[Match], processes: Optional[int] = None
+                   ) -> List[Tuple[Match, Optional[str]]]:
+    """
+    Play matches on a pool of processes worker processes, or one per core
+    if processes is None, and return each match with its winner in the
+    order of matches.
+    """
+    with Pool(processes) as pool:
+        winners = pool.map(play_match, matches, chunksize=1)
+    return list(zip(matches, winners))
+
+
+def standings(results: List[Tuple[Match, Optional[str]]]
+              ) -> Dict[str, List[int]]:
+    """
+    Return the number of wins, losses and draws of each strategy in
+    results.
+
+    >>> standings([(('s', 4, 'ro', 'ab', True), 'ro')])
+    {'ro': [1, 0, 0], 'ab': [0, 1, 0]}
+    """
+    table = {}
+    for (_, _, p1_key, p2_key, _), winner in results:
+        for key in [p1_key, p2_key]:
+            record = table.setdefault(key, [0, 0, 0])
+            if winner is None:
+                record[2] += 1
+            elif winner == key:
+                record[0] += 1
+            else:
+                record[1] += 1
+    return table
+
+
+def elo_ratings(results: List[Tuple[Match, Optional[str]]],
+                k_factor: float = 16.0) -> Dict[str, float]:
+    """
+    Return the Elo rating of each strategy in results, starting everyone
+    at INITIAL_ELO and updating both ratings after each match in turn.
+
+    >>> ratings = elo_ratings([(('s', 4, 'ro', 'ab', True), 'ro')])
+    >>> ratings['ro'], ratings['ab']
+    (1508.0, 1492.0)
+    """
+    ratings = {}
+    for (_, _, p1_key, p2_key, _), winner in results:
+        p1_rating = ratings.setdefault(p1_key, INITIAL_ELO)
+        p2_rating = ratings.setdefault(p2_key, INITIAL_ELO)
+        expected = 1 / (1 + 10 ** ((p2_rating - p1_rating) / 400))
+        if winner is None:
+            score = 0.5
+        else:
+            score = 1.0 if winner == p1_key else 0.0
+        ratings[p1_key] = p1_rating + k_factor * (score - expected)
+        ratings[p2_key] = p2_rating - k_factor * (score - expected)
+    return ratings
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """
+    Run the tournament asked for by the command line arguments and print
+    each strategy's win rate and Elo rating, best first.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('strategies', nargs='+',
+                        choices=sorted(set(usable_strategies) - {'i'}))
+    parser.add_argument('--lengths', type=int, nargs='*', default=[],
+                        help='the Stonehenge side lengths to play on')
+    parser.add_argument('--totals', type=int, nargs='*', default=[],
+                        help='the SubtractSquare totals to play from')
+    parser.add_argument('--processes', type=int,
+                        help='the number of worker processes')
+    args = parser.parse_args(arguments)
+
+    results = run_tournament(schedule(args.strategies, args.lengths,
+                                      args.totals), args.processes)
+    table = standings(results)
+    ratings = elo_ratings(results)
+    print("{:<10}{:>6}{:>8}{:>7}{:>10}{:>8}".format(
+        'strategy', 'wins', 'losses', 'draws', 'win rate', 'elo'))
+    for key in sorted(ratings, key=ratings.get, reverse=True):
+        wins, losses, draws = table[key]
+        print("{:<10}{:>6}{:>8}{:>7}{:>10.1%}{:>8.0f}".format(
+            key, wins, losses, draws, wins / (wins + losses + draws),
+            ratings[key]))
+
+
+if __name__ == '__main__':
+    main()
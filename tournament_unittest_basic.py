@@ -0,0 +1,57 @@
+"""
+A subset of unittests used for testing the tournament runner.
+
+These unittests only test for basic functionality. They are not a guarantee
+that the code works flawlessly.
+"""
+import unittest
+
+from tournament import (INITIAL_ELO, elo_ratings, play_match, run_tournament,
+                        schedule, standings)
+
+
+class TournamentUnitTests(unittest.TestCase):
+    def test_schedule_is_balanced(self):
+        """
+        Test that every strategy plays every other strategy in each seat,
+        moving first and second, on each board size.
+        """
+        matches = schedule(['ro', 'ab', 'mr'], [1, 2], [10])
+        self.assertEqual(len(matches), 3 * 6 * 2)
+        self.assertEqual(len(set(matches)), len(matches))
+        for key in ['ro', 'ab', 'mr']:
+            self.assertEqual(len([m for m in matches if m[2] == key]),
+                             len([m for m in matches if m[3] == key]))
+
+    def test_pool_matches_serial_play(self):
+        """
+        Test that the results played on a pool of worker processes are the
+        results of playing the same matches one by one, in the same order.
+        """
+        matches = schedule(['ro', 'mr'], [1, 2], [10, 18])
+        results = run_tournament(matches, processes=2)
+
+        self.assertEqual([match for match, _ in results], matches)
+        self.assertEqual([winner for _, winner in results],
+                         [play_match(match) for match in matches])
+
+    def test_standings_and_elo(self):
+        """
+        Test that a strategy that wins every match has every win and the
+        highest rating, and that ratings are zero-sum.
+        """
+        results = [(('s', 18, 'ab', 'ro', True), 'ab'),
+                   (('s', 18, 'ro', 'ab', False), 'ab'),
+                   (('s', 18, 'ro', 'mr', True), None)]
+        table = standings(results)
+        ratings = elo_ratings(results)
+
+        self.assertEqual(table['ab'], [2, 0, 0])
+        self.assertEqual(table['ro'], [0, 2, 1])
+        self.assertEqual(table['mr'], [0, 0, 1])
+        self.assertEqual(max(ratings, key=ratings.get), 'ab')
+        self.assertAlmostEqual(sum(ratings.values()), 3 * INITIAL_ELO)
+
+
+if __name__ == "__main__":
+    unittest.main()